@@ -0,0 +1,132 @@
+"""Strict allowlist mode: block every user process that is not allowed.
+
+Processes of system accounts, kernel threads, FocusGuard and its
+ancestors, desktop session components and executables in system
+directories are never blocked. Verdicts are cached per PID, so a process
+is classified once in its lifetime. New PIDs of an executable seen before
+reuse its cached result, keyed by the file's identity (path, device,
+inode, mtime) and optionally its SHA-256.
+"""
+import hashlib
+import os
+import sys
+
+# Desktop, shell and OS infrastructure that must keep running in a session
+SESSION_NAMES = frozenset({
+    # Linux desktop sessions
+    'systemd', 'dbus-daemon', 'dbus-broker', 'xorg', 'xwayland', 'gnome-shell',
+    'gnome-session-binary', 'kwin_x11', 'kwin_wayland', 'plasmashell', 'ksmserver',
+    'xfwm4', 'xfce4-session', 'mutter', 'sway', 'hyprland', 'pipewire',
+    'pipewire-pulse', 'wireplumber', 'pulseaudio', 'ibus-daemon', 'fcitx5',
+    'ssh-agent', 'gpg-agent', 'gnome-keyring-daemon', 'polkit-gnome-authentication-agent-1',
+    'bash', 'zsh', 'fish', 'sh', 'dash', 'login', 'sshd', 'tmux', 'screen',
+    # Windows
+    'explorer.exe', 'dwm.exe', 'csrss.exe', 'winlogon.exe', 'wininit.exe', 'services.exe',
+    'lsass.exe', 'smss.exe', 'svchost.exe', 'sihost.exe', 'ctfmon.exe', 'conhost.exe',
+    'fontdrvhost.exe', 'taskhostw.exe', 'runtimebroker.exe', 'searchhost.exe',
+    'startmenuexperiencehost.exe', 'shellexperiencehost.exe', 'textinputhost.exe',
+    'audiodg.exe', 'dllhost.exe', 'securityhealthsystray.exe',
+    # macOS
+    'loginwindow', 'windowserver', 'dock', 'finder', 'systemuiserver', 'launchd',
+})
+
+SYSTEM_PREFIXES = tuple(prefix.lower() for prefix in (
+    '/usr/libexec/', '/usr/lib/systemd/', '/lib/systemd/', '/usr/lib/xorg/',
+    '/sbin/', '/usr/sbin/', '/system/', '/usr/lib/gnome-', '/usr/lib/polkit',
+    os.path.join(os.environ.get('SystemRoot', 'C:\\Windows'), ''),
+))
+
+HASH_CHUNK = 1 << 20
+
+
+def login_uid_range(path='/etc/login.defs', default=(1000, 60000)):
+    """UIDs given to human accounts; anything outside is a system account"""
+    limits = dict(zip(('UID_MIN', 'UID_MAX'), default))
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] in limits:
+                    limits[fields[0]] = int(fields[1])
+    except (OSError, ValueError):
+        pass
+    return limits['UID_MIN'], limits['UID_MAX']
+
+
+def protected_pids():
+    """This process and its ancestors, i.e. the session it was started from"""
+    import psutil
+    pids = {os.getpid()}
+    try:
+        pids.update(parent.pid for parent in psutil.Process().parents())
+    except psutil.Error:
+        pass
+    return frozenset(pids)
+
+
+class ExecutableClassifier:
+    """Decide whether strict mode may block a process"""
+
+    def __init__(self, hash_contents=False, uid_range=None):
+        self.hash_contents = hash_contents
+        self.uid_range = login_uid_range() if uid_range is None else uid_range
+        self.check_owner = sys.platform != 'win32'
+        self.spared = protected_pids()
+        self.digests = {}   # (dev, inode, size, mtime, ctime) -> SHA-256
+
+    def identity(self, exe):
+        """Hashable key for the file at exe, or None if it cannot be read"""
+        try:
+            st = os.stat(exe)
+        except OSError:
+            return None
+        if not self.hash_contents:
+            return exe, st.st_dev, st.st_ino, st.st_mtime_ns
+        # ctime cannot be set by the file's owner, so a rewrite always rehashes
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+        digest = self.digests.get(key)
+        if digest is None:
+            digest = self.digests[key] = self._digest(exe)
+            if digest is None:
+                return None
+        return exe, digest
+
+    @staticmethod
+    def _digest(exe):
+        sha = hashlib.sha256()
+        try:
+            with open(exe, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                    sha.update(chunk)
+        except OSError:
+            return None
+        return sha.hexdigest()
+
+    def is_protected(self, snapshot, pid, name, exe):
+        """True for system and session processes, which strict mode never touches"""
+        if pid in self.spared or name in SESSION_NAMES or not exe:
+            # No executable means a kernel thread or a process we may not inspect
+            return True
+        if self.check_owner:
+            owner = snapshot.owner(pid)
+            if owner is None or not self.uid_range[0] <= owner <= self.uid_range[1]:
+                return True
+        return False
+
+    def blocks(self, snapshot, pid, name, session):
+        """True if session's strict allowlist blocks pid"""
+        exe, cmdline = snapshot.details(pid)
+        if self.is_protected(snapshot, pid, name, exe) or exe.lower().startswith(SYSTEM_PREFIXES):
+            return False
+        identity = self.identity(exe)
+        if identity is None:
+            return False
+        matcher = session.matcher
+        if matcher.allow.cmdline:
+            # Command-line rules differ per process, so nothing to share
+            return not matcher.allows(name, exe, cmdline)
+        key = (identity, name)
+        verdict = session.exe_verdicts.get(key)
+        if verdict is None:
+            verdict = session.exe_verdicts[key] = not matcher.allows(name, exe)
+        return verdict
@@ -1,183 +1,185 @@
-import json
-import psutil
-import threading
-import time
 import logging
-from pathlib import Path
-from PyQt5.QtCore import QObject, pyqtSignal
-
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='focusguard.log',
-    filemode='w'
-)
-
-class FocusGuard(QObject):
+import threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from backend.core import FocusGuardCore
+from backend.client import DaemonError
+from backend.event_aggregator import EventAggregator
+
+# Coalesced events are delivered at most once per this many milliseconds
+FRAME_MS = 50
+
+
+class GuardSignals(QObject):
+    """Signals shared by the adapters, with high-rate events coalesced.
+
+    app_blocked and timer_updated from the monitor thread are not queued to
+    the UI one by one. They are counted in an EventAggregator and flushed
+    once per frame: blocks_updated carries per-app totals, app_blocked fires
+    once per app that changed, and timer_updated only when the value changed.
+    """
     # Define signals for UI communication
     session_started = pyqtSignal(str)
     session_stopped = pyqtSignal(str)
     app_blocked = pyqtSignal(str)
     status_changed = pyqtSignal(str)
     timer_updated = pyqtSignal(int, int)  # minutes, seconds
-    
+    mappings_changed = pyqtSignal()
+    blocks_updated = pyqtSignal(dict)  # name -> (count, last seen timestamp)
+    flush_requested = pyqtSignal()
+
     def __init__(self):
         super().__init__()
-        self.allowed_processes = []
-        self.block_list = []
-        self.is_active = False
-        self.monitor_thread = None
-        self.timer_thread = None
-        self.stop_event = threading.Event()
-        self.load_app_mappings()
-        logging.info("FocusGuard initialized")
-
-    def load_app_mappings(self):
-        """Load app display name to process name mappings"""
+        self.aggregator = EventAggregator()
+        self.reported_blocks = {}
+        # Queued when emitted from a worker thread, so the timer starts on ours
+        self.flush_requested.connect(self.schedule_flush)
+
+    def deliver(self, event, *args):
+        """Forward one backend event, from any thread"""
+        if event == 'app_blocked':
+            if self.aggregator.record_block(*args):
+                self.flush_requested.emit()
+        elif event == 'timer_updated':
+            if self.aggregator.record_timer(*args):
+                self.flush_requested.emit()
+        else:
+            if event == 'session_started' and self.aggregator.reset():
+                self.flush_requested.emit()
+            getattr(self, event).emit(*args)
+
+    def schedule_flush(self):
+        QTimer.singleShot(FRAME_MS, self.flush)
+
+    def flush(self):
+        blocks, timer = self.aggregator.drain()
+        if timer is not None:
+            self.timer_updated.emit(*timer)
+        if blocks is not None:
+            for name, (count, _) in blocks.items():
+                if self.reported_blocks.get(name) != count:
+                    self.app_blocked.emit(name)
+            self.reported_blocks = {name: count for name, (count, _) in blocks.items()}
+            self.blocks_updated.emit(blocks)
+
+
+class FocusGuard(GuardSignals):
+    """Qt adapter that re-emits FocusGuardCore events as signals"""
+    
+    def __init__(self, core=None, **core_options):
+        super().__init__()
+        self.core = core or FocusGuardCore(**core_options)
+        for event in FocusGuardCore.EVENTS:
+            self.core.subscribe(event, lambda *args, event=event: self.deliver(event, *args))
+        self.core.start_scheduler()
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined on the adapter itself
+        if name == 'core':
+            raise AttributeError(name)
+        return getattr(self.core, name)
+
+    def start_session(self, allowed_apps, duration, **options):
+        return self.core.start_session(allowed_apps, duration, **options)
+
+    def stop_session(self):
+        return self.core.stop_session()
+
+    def pause_session(self):
+        self.core.pause_session()
+
+    def resume_session(self):
+        self.core.resume_session()
+
+    def extend_session(self, minutes):
+        self.core.extend_session(minutes)
+
+    def get_app_list(self):
+        return self.core.get_app_list()
+
+    def get_stats(self, days=None):
+        return self.core.get_stats(days)
+
+    def get_metrics(self):
+        return self.core.get_metrics()
+
+    def get_schedules(self):
+        return self.core.get_schedules()
+
+    def add_schedule(self, name, days, start, end, apps):
+        return self.core.add_schedule(name, days, start, end, apps)
+
+    def remove_schedule(self, schedule_id):
+        return self.core.remove_schedule(schedule_id)
+
+    def add_custom_app(self, display_name, process_name):
+        return self.core.add_custom_app(display_name, process_name)
+
+    def import_apps(self, entries):
+        return self.core.import_apps(entries)
+
+
+class DaemonFocusGuard(GuardSignals):
+    """Qt adapter that drives a running FocusGuard daemon over its socket"""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self.event_thread = threading.Thread(target=self.forward_events, daemon=True)
+        self.event_thread.start()
+
+    def forward_events(self):
+        """Re-emit daemon events as signals until the connection drops"""
         try:
-            with open(Path(__file__).parent / 'process_map.json', 'r') as f:
-                self.app_mappings = json.load(f)
-            logging.info(f"Loaded {len(self.app_mappings)} app mappings")
-        except Exception as e:
-            logging.error(f"Error loading process map: {e}")
-            self.app_mappings = {}
-
-    def start_session(self, allowed_apps, duration):
-        """Start focus session with allowed apps and duration"""
-        if not allowed_apps:
-            logging.warning("No apps selected for session")
-            self.session_started.emit("Select at least one app to start session")
-            return
-            
+            for event, args in self.client.events():
+                self.deliver(event, *args)
+        except (OSError, ValueError) as e:
+            logging.error(f"Lost daemon event stream: {e}")
+        self.status_changed.emit("Disconnected from FocusGuard daemon")
+
+    def call(self, cmd, **args):
         try:
-            # Convert display names to process names
-            self.allowed_processes = [
-                self.app_mappings[app] for app in allowed_apps 
-                if app in self.app_mappings
-            ]
-            
-            # Create block list (unselected apps from our list)
-            self.block_list = [
-                process for display, process in self.app_mappings.items()
-                if display not in allowed_apps
-            ]
-            
-            logging.info(f"Session started | Duration: {duration} mins")
-            logging.info(f"Allowed: {self.allowed_processes}")
-            logging.info(f"Blocking: {self.block_list}")
-            
-            self.is_active = True
-            self.stop_event.clear()
-            
-            # Start monitoring in separate thread
-            self.monitor_thread = threading.Thread(target=self.monitor_processes)
-            self.monitor_thread.daemon = True
-            self.monitor_thread.start()
-            
-            # Start timer in separate thread
-            self.timer_thread = threading.Thread(target=self.run_timer, args=(duration,))
-            self.timer_thread.daemon = True
-            self.timer_thread.start()
-            
-            success_msg = "Session started successfully"
-            self.session_started.emit(success_msg)
-            logging.info(success_msg)
-            return success_msg
-            
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            logging.error(f"Start session error: {e}")
-            self.session_started.emit(error_msg)
-            return error_msg
-
-    def run_timer(self, duration_minutes):
-        """Run the focus session timer and emit updates"""
-        total_seconds = duration_minutes * 60
-        while total_seconds > 0 and self.is_active:
-            mins, secs = divmod(total_seconds, 60)
-            self.timer_updated.emit(mins, secs)
-            time.sleep(1)
-            total_seconds -= 1
-            
-        # If timer completed naturally, stop session
-        if self.is_active:
-            self.stop_session()
+            return self.client.request(cmd, **args)
+        except (DaemonError, OSError) as e:
+            logging.error(f"Daemon request {cmd} failed: {e}")
+            self.status_changed.emit(f"Daemon error: {e}")
+            return None
+
+    def start_session(self, allowed_apps, duration, **options):
+        return self.call('start', apps=allowed_apps, duration=duration, **options)
 
     def stop_session(self):
-        """Stop focus session"""
-        if self.is_active:
-            self.is_active = False
-            self.stop_event.set()
-            
-            # Wait for threads to finish
-            if self.monitor_thread:
-                self.monitor_thread.join(timeout=2.0)
-            if self.timer_thread:
-                self.timer_thread.join(timeout=2.0)
-                
-            success_msg = "Session stopped"
-            self.session_stopped.emit(success_msg)
-            logging.info(success_msg)
-            return success_msg
-            
-        return "No active session"
-
-    def monitor_processes(self):
-        """Monitor and block unselected processes"""
-        logging.info("Monitoring started")
-        blocked_count = 0
-        
-        while not self.stop_event.is_set():
-            try:
-                # Get current processes
-                current_processes = [p.name().lower() for p in psutil.process_iter(['name'])]
-                
-                # Check against block list
-                for process in self.block_list:
-                    if process.lower() in current_processes:
-                        if self.terminate_process(process):
-                            blocked_count += 1
-                            self.app_blocked.emit(process)
-                            logging.info(f"Blocked: {process}")
-            
-            except Exception as e:
-                logging.error(f"Monitoring error: {e}")
-                self.status_changed.emit(f"Monitoring error: {e}")
-            
-            # Check every 5 seconds
-            time.sleep(5)
-        
-        logging.info(f"Monitoring stopped | Total blocked: {blocked_count}")
-
-    def terminate_process(self, process_name):
-        """Terminate a process by name"""
-        try:
-            for proc in psutil.process_iter(['name']):
-                if proc.name().lower() == process_name.lower():
-                    proc.terminate()
-                    logging.debug(f"Terminated: {proc.name()} (PID: {proc.pid})")
-                    return True
-            return False
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
-            logging.warning(f"Termination failed for {process_name}: {e}")
-            return False
-        except Exception as e:
-            logging.error(f"Unexpected termination error: {e}")
-            return False
+        return self.call('stop')
+
+    def pause_session(self):
+        self.call('pause')
+
+    def resume_session(self):
+        self.call('resume')
+
+    def extend_session(self, minutes):
+        self.call('extend', minutes=minutes)
 
     def get_app_list(self):
-        """Get list of apps with display names"""
-        return list(self.app_mappings.keys())
+        return self.call('list-apps') or []
+
+    def get_stats(self, days=None):
+        return self.call('stats', days=days) or {'per_day': {}, 'per_app': {}}
+
+    def get_metrics(self):
+        return self.call('metrics') or {'enabled': False}
+
+    def get_schedules(self):
+        return self.call('list-schedules') or []
+
+    def add_schedule(self, name, days, start, end, apps):
+        return self.call('add-schedule', name=name, days=sorted(days), start=start, end=end, apps=apps)
+
+    def remove_schedule(self, schedule_id):
+        return bool(self.call('remove-schedule', id=schedule_id))
 
     def add_custom_app(self, display_name, process_name):
-        """Add custom app to mappings"""
-        try:
-            self.app_mappings[display_name] = process_name
-            with open(Path(__file__).parent / 'process_map.json', 'w') as f:
-                json.dump(self.app_mappings, f, indent=2)
-            logging.info(f"Added custom app: {display_name} -> {process_name}")
-            return True
-        except Exception as e:
-            logging.error(f"Add app error: {e}")
-            return False
\ No newline at end of file
+        return bool(self.call('add-app', name=display_name, process=process_name))
+
+    def import_apps(self, entries):
+        return self.call('import-apps', entries=dict(entries)) or 0
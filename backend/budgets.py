@@ -0,0 +1,280 @@
+import datetime
+import heapq
+import json
+import threading
+import logging
+from pathlib import Path
+
+from backend.matcher import RuleSet
+from backend.state_file import JsonStateWriter
+
+DEFAULT_LEDGER_PATH = Path(__file__).parent / 'budget_usage.json'
+PERIODS = ('session', 'day')
+
+# While a budgeted app runs, rescan at least this often (seconds) so exits
+# missed by exec-event monitoring stop its clock; usage is saved as often
+RESYNC_INTERVAL = 60.0
+
+
+def next_midnight(now):
+    tomorrow = datetime.date.fromtimestamp(now) + datetime.timedelta(days=1)
+    return datetime.datetime.combine(tomorrow, datetime.time()).timestamp()
+
+
+class BudgetLedger:
+    """Budget usage kept in a small JSON file, replaced atomically on save.
+
+    Saves return at once; the file is written by a background thread.
+    """
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.entries = None
+        self.writer = JsonStateWriter(self.path, fsync=False)
+
+    def load(self, scope):
+        """Return the saved state for scope, or None"""
+        with self.lock:
+            if self.entries is None:
+                try:
+                    with open(self.path) as f:
+                        self.entries = json.load(f)
+                except FileNotFoundError:
+                    self.entries = {}
+                except (OSError, ValueError) as e:
+                    logging.error("Unreadable budget ledger %s: %s", self.path, e)
+                    self.entries = {}
+            return self.entries.get(scope)
+
+    def save(self, scope, state):
+        with self.lock:
+            if self.entries is None:
+                self.entries = {}
+            self.entries[scope] = state
+            self.writer.write(dict(self.entries))
+
+
+class BudgetTracker:
+    """Runtime of budgeted apps within one session or calendar day.
+
+    An app is running while any process with one of its names is in the
+    snapshot. Its clock starts at the earliest such process's start time
+    and stops when the last one is dropped, so accounting only touches
+    PIDs that started or ended since the previous refresh. The moments
+    running apps run out sit in a min-heap; a tick costs a peek at its top
+    however many budgets there are.
+
+    Name rules (exact, glob or regex) are checked once per distinct name.
+    Executable and command-line rules need details(pid) -> (exe, cmdline),
+    which is asked only for new PIDs no name rule covers, and only when
+    some budget has such rules. accepts, if given, is asked once per new
+    budgeted PID whether it counts here.
+    """
+
+    def __init__(self, budgets, mappings, period='session', scope='session',
+                 ledger=None, started_at=None, accepts=None, details=None):
+        if period not in PERIODS:
+            raise ValueError(f"Unknown budget period: {period}")
+        self.accepts = accepts
+        self.details = details
+        self.period = period
+        self.scope = scope
+        self.ledger = ledger
+        self.limits = {app: float(minutes) * 60 for app, minutes in budgets.items()}
+        self.rules = {app: RuleSet([mappings[app]]) for app in self.limits if app in mappings}
+        self.detail_rules = [
+            (app, rules) for app, rules in self.rules.items() if rules.needs_details
+        ] if details is not None else []
+        self.name_apps = {}     # name -> app, or None if no budget covers it
+        self.pid_apps = {}      # pid -> app for live budgeted processes
+        self.counts = {}        # app -> live process count
+        self.running_since = {} # app -> timestamp its clock last started
+        self.used = {app: 0.0 for app in self.limits}
+        self.banked_at = {}     # app -> time up to which used is accounted
+        self.exhausted = set()
+        self.heap = []          # (timestamp the app runs out, app)
+        self.last_sync = None
+        self.saved_at = None
+        self.lock = threading.Lock()
+
+        now = started_at if started_at is not None else datetime.datetime.now().timestamp()
+        self.period_start = now
+        self.period_key = str(now)
+        if period == 'day':
+            today = datetime.date.fromtimestamp(now)
+            self.period_start = datetime.datetime.combine(today, datetime.time()).timestamp()
+            self.period_key = today.isoformat()
+        self.restore()
+
+    def app_for(self, name):
+        """Budgeted app whose rules cover process name, or None"""
+        try:
+            return self.name_apps[name]
+        except KeyError:
+            pass
+        app = next((app for app, rules in self.rules.items() if rules.match_name(name)), None)
+        self.name_apps[name] = app
+        return app
+
+    def app_for_pid(self, pid, name):
+        """Budgeted app covering pid by name, executable or command line"""
+        app = self.app_for(name)
+        if app is None and self.detail_rules:
+            exe, cmdline = self.details(pid)
+            app = next((
+                app for app, rules in self.detail_rules if rules.match_details(exe, cmdline)
+            ), None)
+        return app
+
+    def on_processes(self, started, ended, now):
+        """Snapshot watcher: start and stop app clocks from PID changes"""
+        with self.lock:
+            changed = False
+            for pid, name, started_at in ended:
+                app = self.pid_apps.pop(pid, None)
+                if app is None:
+                    continue
+                self.counts[app] -= 1
+                if not self.counts[app]:
+                    self._stop_clock(app, now)
+                    changed = True
+            for pid, name, started_at in started:
+                if pid in self.pid_apps:
+                    continue
+                app = self.app_for_pid(pid, name)
+                if app is None or (self.accepts and not self.accepts(pid)):
+                    continue
+                self.pid_apps[pid] = app
+                self.counts[app] = self.counts.get(app, 0) + 1
+                since = max(started_at, self.period_start, self.banked_at.get(app, 0.0))
+                if self.counts[app] == 1:
+                    self.running_since[app] = min(since, now)
+                    self._push_deadline(app)
+                    changed = True
+                elif since < self.running_since[app]:
+                    # An older process was found late; it started the clock
+                    self.running_since[app] = since
+                    self._push_deadline(app)
+            self.last_sync = now
+        if changed:
+            self.save()
+
+    def close(self, now):
+        """Stop every clock at now and save; the tracker sees no more processes"""
+        with self.lock:
+            for app in list(self.running_since):
+                self._stop_clock(app, now)
+            self.pid_apps.clear()
+            self.counts.clear()
+            self.heap = []
+        self.save()
+
+    def _stop_clock(self, app, now):
+        since = self.running_since.pop(app, None)
+        if since is not None:
+            self.used[app] += max(0.0, now - since)
+        self.banked_at[app] = now
+
+    def _push_deadline(self, app):
+        deadline = self._deadline(app)
+        if deadline is not None:
+            heapq.heappush(self.heap, (deadline, app))
+
+    def _deadline(self, app):
+        since = self.running_since.get(app)
+        if since is None or app in self.exhausted:
+            return None
+        return since + self.limits[app] - self.used[app]
+
+    def check(self, now):
+        """Return the apps that ran out of budget, or got a new day's, since the last check"""
+        changed = set()
+        with self.lock:
+            self.last_sync = now
+            # Running clocks are saved now and then so a crash loses little
+            due = bool(self.running_since) and (
+                self.saved_at is None or now >= self.saved_at + RESYNC_INTERVAL)
+            if self.period == 'day' and now >= next_midnight(self.period_start):
+                changed.update(self.exhausted)
+                self._roll_over()
+            while self.heap and self.heap[0][0] <= now:
+                deadline, app = heapq.heappop(self.heap)
+                # Entries are replaced rather than removed, so skip stale ones
+                if deadline == self._deadline(app):
+                    self.exhausted.add(app)
+                    changed.add(app)
+        if changed or due:
+            self.save()
+        return changed
+
+    def _roll_over(self):
+        """Start a new day: bank running clocks at midnight and reset usage"""
+        midnight = next_midnight(self.period_start)
+        for app in list(self.running_since):
+            self._stop_clock(app, midnight)
+            self.running_since[app] = midnight
+        self.period_start = midnight
+        self.period_key = datetime.date.fromtimestamp(midnight).isoformat()
+        self.used = {app: 0.0 for app in self.limits}
+        self.banked_at = {}
+        self.exhausted = set()
+        self.heap = []
+        for app in self.running_since:
+            self._push_deadline(app)
+        logging.info("Budgets reset for %s", self.period_key)
+
+    def next_deadline(self):
+        """Timestamp of the next budget event worth a scan, or None"""
+        with self.lock:
+            deadlines = []
+            if self.heap:
+                deadlines.append(self.heap[0][0])
+            if self.running_since and self.last_sync is not None:
+                deadlines.append(self.last_sync + RESYNC_INTERVAL)
+            if self.period == 'day':
+                deadlines.append(next_midnight(self.period_start))
+            return min(deadlines) if deadlines else None
+
+    def usage(self, now):
+        """{app: {'used', 'limit', 'exhausted'}} in seconds"""
+        with self.lock:
+            return {
+                app: {
+                    'used': round(min(limit, self.used[app] + max(
+                        0.0, now - self.running_since.get(app, now))), 1),
+                    'limit': limit,
+                    'exhausted': app in self.exhausted,
+                }
+                for app, limit in self.limits.items()
+            }
+
+    def restore(self):
+        if self.ledger is None:
+            return
+        state = self.ledger.load(self.scope)
+        if not state or state.get('period') != self.period or state.get('key') != self.period_key:
+            return
+        for app, used in state.get('used', {}).items():
+            if app in self.used:
+                self.used[app] = used
+        # Time after this was not seen; live processes restart the clock
+        banked_at = state.get('saved_at', 0.0)
+        self.banked_at = {app: banked_at for app in self.limits}
+        for app, since in state.get('running', {}).items():
+            if app in self.used:
+                # Count up to the save; anything later is counted if still running
+                self.used[app] += max(0.0, banked_at - since)
+        self.exhausted = {app for app in state.get('exhausted', []) if app in self.limits}
+
+    def save(self):
+        if self.ledger is None:
+            return
+        with self.lock:
+            self.saved_at = datetime.datetime.now().timestamp()
+            state = {
+                'period': self.period, 'key': self.period_key,
+                'used': dict(self.used), 'running': dict(self.running_since),
+                'exhausted': sorted(self.exhausted), 'saved_at': self.saved_at,
+            }
+        self.ledger.save(self.scope, state)
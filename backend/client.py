@@ -0,0 +1,58 @@
+import json
+import socket
+
+from backend.daemon import default_socket_path
+
+
+class DaemonError(Exception):
+    """Raised when the daemon rejects a request"""
+
+
+class DaemonClient:
+    """Minimal client for the FocusGuard daemon's JSON-lines socket API"""
+
+    def __init__(self, socket_path=None, timeout=5.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def is_available(self):
+        try:
+            self.connect().close()
+            return True
+        except OSError:
+            return False
+
+    def request(self, cmd, **args):
+        """Send one command and return its result, raising DaemonError on failure"""
+        with self.connect() as sock:
+            sock.sendall(json.dumps({'cmd': cmd, **args}).encode() + b'\n')
+            reply = json.loads(sock.makefile('rb').readline() or b'null')
+        if not reply:
+            raise DaemonError("Daemon closed the connection")
+        if not reply.get('ok'):
+            raise DaemonError(reply.get('error') or reply.get('result'))
+        return reply['result']
+
+    def events(self):
+        """Yield (event, args) tuples from the daemon until it disconnects"""
+        sock = self.connect()
+        sock.settimeout(None)
+        try:
+            sock.sendall(b'{"cmd": "subscribe"}\n')
+            stream = sock.makefile('rb')
+            stream.readline()  # subscription acknowledgement
+            for line in stream:
+                message = json.loads(line)
+                yield message['event'], message['args']
+        finally:
+            sock.close()
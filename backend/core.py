@@ -0,0 +1,713 @@
+import datetime
+import psutil
+import threading
+import time
+import logging
+
+from backend.process_snapshot import ProcessSnapshot
+from backend.scan_scheduler import ScanScheduler
+from backend.enforcement import TreeEnforcer
+from backend.freezer import ANY_OWNER, TreeFreezer, thaw_leftovers
+from backend.log_pipeline import log_event
+from backend.matcher import describe
+from backend.policy import ALL_USERS, PolicyEngine, UserSession
+from backend.allowlist import ExecutableClassifier
+from backend.budgets import BudgetLedger, BudgetTracker
+from backend.mapping_store import MappingStore, MappingWatcher
+from backend.session_stats import SessionStats
+from backend.metrics import NullMetrics
+from backend.respawn import RespawnTracker, find_launcher, kill_process_group
+from backend.schedules import Schedule, ScheduleRunner, ScheduleStore, parse_days, parse_time
+
+# subscribe() filter that receives every user's events
+ANY_UID = object()
+
+
+class FocusGuardCore:
+    """Session and enforcement logic with no GUI dependencies.
+
+    Sessions are keyed by the UID whose processes they govern; the default
+    ALL_USERS session covers every user without a session of their own.
+    One monitor thread serves all of them.
+
+    Front ends register callbacks with subscribe(); events are delivered on
+    whichever thread produced them.
+    """
+
+    # Events and their arguments
+    EVENTS = {
+        'session_started': (str,),
+        'session_stopped': (str,),
+        'app_blocked': (str,),
+        'status_changed': (str,),
+        'timer_updated': (int, int),  # minutes, seconds
+        'mappings_changed': (),
+    }
+    
+    # Monitor modes: 'poll' scans the process table every 5 seconds,
+    # 'events' reacts to exec notifications, 'auto' prefers events
+    MONITOR_MODES = ('auto', 'events', 'poll')
+    # kill terminates blocked apps; freeze suspends them until the session ends
+    ENFORCEMENT_MODES = ('kill', 'freeze')
+
+    def __init__(self, monitor_mode='auto', use_procfs=None, mapping_store=None,
+                 watch_mappings=True, stats=None, metrics=None, schedule_store=None,
+                 hash_executables=False, enforcement='kill', budget_ledger=None):
+        if monitor_mode not in self.MONITOR_MODES:
+            raise ValueError(f"Unknown monitor mode: {monitor_mode}")
+        if enforcement not in self.ENFORCEMENT_MODES:
+            raise ValueError(f"Unknown enforcement mode: {enforcement}")
+        self.monitor_mode = monitor_mode
+        self.enforcement = enforcement
+        # Strict mode identifies executables by SHA-256 too when hash_executables
+        self.policies = PolicyEngine(ExecutableClassifier(hash_contents=hash_executables))
+        self.snapshot = ProcessSnapshot(use_procfs=use_procfs)
+        self.scheduler = ScanScheduler()
+        # Whatever a crashed run left frozen is released in either mode
+        thaw_leftovers()
+        if enforcement == 'freeze':
+            self.enforcer = TreeFreezer(on_result=self.on_tree_enforced)
+        else:
+            self.enforcer = TreeEnforcer(on_result=self.on_tree_enforced)
+        self.monitor_thread = None
+        self.monitor_lock = threading.Lock()
+        # Session history; nothing is opened until the first record
+        self.stats = stats if stats is not None else SessionStats()
+        # A backend.metrics.Metrics to collect into; the default discards everything
+        self.metrics = metrics if metrics is not None else NullMetrics()
+        # Set to interrupt the monitor's wait and force an immediate rescan
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.listeners = {event: [] for event in self.EVENTS}
+        # Mappings are read on first use so construction stays cheap
+        self._app_mappings = None
+        self.mapping_store = mapping_store
+        self.watch_mappings = watch_mappings
+        self.mapping_watcher = None
+        self.schedule_store = schedule_store
+        self.schedule_runner = None
+        # App budget usage, kept across restarts; read when a budget first needs it
+        self.budget_ledger = budget_ledger if budget_ledger is not None else BudgetLedger()
+        logging.info("FocusGuard initialized")
+
+    def subscribe(self, event, callback, uid=ANY_UID):
+        """Call callback with the event's arguments whenever it fires
+
+        With a uid, only events about that user's session and events that
+        concern every user are delivered.
+        """
+        if event not in self.listeners:
+            raise ValueError(f"Unknown event: {event}")
+        self.listeners[event].append((callback, uid))
+
+    def unsubscribe(self, event, callback):
+        listeners = self.listeners.get(event, [])
+        for entry in list(listeners):
+            if entry[0] == callback:
+                listeners.remove(entry)
+
+    def emit(self, event, *args, uid=ALL_USERS):
+        for callback, wanted in list(self.listeners[event]):
+            if wanted is not ANY_UID and uid is not ALL_USERS and wanted != uid:
+                continue
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.error("Listener error for %s: %s", event, e)
+
+    @property
+    def is_active(self):
+        """True while any session is running"""
+        return len(self.policies) > 0
+
+    @property
+    def app_mappings(self):
+        if self._app_mappings is None:
+            self.load_app_mappings()
+        return self._app_mappings
+
+    @app_mappings.setter
+    def app_mappings(self, mappings):
+        self._app_mappings = mappings
+
+    def load_app_mappings(self):
+        """Load app display name to process name mappings"""
+        try:
+            if self.mapping_store is None:
+                self.mapping_store = MappingStore()
+            self.app_mappings = self.mapping_store.load()
+            logging.info(f"Loaded {len(self.app_mappings)} app mappings")
+        except Exception as e:
+            logging.error(f"Error loading process map: {e}")
+            self.app_mappings = {}
+            return
+        if self.watch_mappings and self.mapping_watcher is None:
+            self.mapping_watcher = MappingWatcher(self.mapping_store, self.on_mappings_changed)
+            self.mapping_watcher.start()
+
+    def on_mappings_changed(self, mappings):
+        """Swap in reloaded mappings, updating running sessions' rules"""
+        self.app_mappings = mappings
+        logging.info(f"Reloaded {len(mappings)} app mappings")
+        if self.is_active:
+            for session in self.policies:
+                session.compile(mappings)
+            # Rescan now so newly blocked apps do not wait for the next tick
+            self.wake_event.set()
+        self.emit('mappings_changed')
+
+    def start_session(self, allowed_apps, duration, min_interval=0.5,
+                      max_interval=5.0, tick_budget=0.05, uid=ALL_USERS, strict=False,
+                      budgets=None, budget_period='session'):
+        """Start focus session with allowed apps and duration
+
+        uid limits the session to that user's processes; by default it
+        covers every user without a session of their own. A running
+        session for the same uid is replaced.
+
+        strict blocks every user process the allowed apps do not cover,
+        not only the mapped apps; system and session processes are spared.
+
+        budgets maps apps to minutes they may run before being blocked,
+        counted per session or per calendar day (budget_period).
+
+        min_interval/max_interval bound the polling delay in seconds and
+        tick_budget caps the CPU seconds one polling tick may spend; they
+        take effect when no other session is running.
+        """
+        if not allowed_apps and not budgets:
+            logging.warning("No apps selected for session")
+            self.emit('session_started', "Select at least one app to start session", uid=uid)
+            return
+            
+        try:
+            session = UserSession(uid, allowed_apps, duration * 60, RespawnTracker(), strict=strict)
+            if budgets:
+                session.budgets = BudgetTracker(
+                    budgets, self.app_mappings, budget_period,
+                    scope=f"{budget_period}:{'all' if uid is ALL_USERS else uid}",
+                    ledger=self.budget_ledger, started_at=session.started_at,
+                    accepts=lambda pid: self.policies.governs(self.snapshot, pid, session),
+                    details=self.snapshot.details,
+                )
+            session.compile(self.app_mappings)
+            
+            log_event(
+                'session_start', uid=uid, duration_mins=duration, mode=self.monitor_mode, strict=strict,
+                allowed=session.allowed_processes, blocking=session.block_list,
+                budgets=budgets or None,
+            )
+            
+            previous = self.policies.add(session)
+            if previous is not None:
+                self.release_budgets(previous)
+                self.record_session(previous)
+            if session.budgets is not None:
+                # Running apps start their clocks now; later changes arrive with each refresh
+                self.snapshot.refresh()
+                self.snapshot.watch(session.budgets.on_processes)
+            self.metrics.sessions.inc()
+            
+            # The monitor thread also drives the countdown from its deadline
+            self.emit('timer_updated', *session.last_display, uid=uid)
+            self.ensure_monitor(min_interval, max_interval, tick_budget)
+            
+            success_msg = "Session started successfully"
+            self.emit('session_started', success_msg, uid=uid)
+            logging.info(success_msg)
+            return success_msg
+            
+        except Exception as e:
+            error_msg = f"Error: {str(e)}"
+            logging.error(f"Start session error: {e}")
+            self.emit('session_started', error_msg, uid=uid)
+            return error_msg
+
+    def ensure_monitor(self, min_interval, max_interval, tick_budget):
+        """Start the shared monitor thread unless it is already running"""
+        with self.monitor_lock:
+            thread = self.monitor_thread
+            current = threading.current_thread()
+            if thread is not None and thread.is_alive():
+                if thread is current or not self.stop_event.is_set():
+                    # Keep the running loop going and rescan with the new rules
+                    self.stop_event.clear()
+                    self.wake_event.set()
+                    return
+                # The loop is on its way out; let it finish first
+                thread.join(timeout=2.0)
+            self.scheduler = ScanScheduler(min_interval, max_interval, tick_budget)
+            self.stop_event.clear()
+            self.wake_event.clear()
+            self.monitor_thread = threading.Thread(target=self.run_monitor)
+            self.monitor_thread.daemon = True
+            self.monitor_thread.start()
+
+    def pause_session(self, uid=ALL_USERS):
+        """Pause the countdown and enforcement"""
+        session = self.policies.get(uid)
+        if session:
+            session.timer.pause()
+            self.thaw(uid)
+            self.emit('status_changed', "Focus session paused", uid=uid)
+            logging.info("Session paused")
+
+    def resume_session(self, uid=ALL_USERS):
+        """Resume a paused session"""
+        session = self.policies.get(uid)
+        if session and session.paused:
+            session.timer.resume()
+            # Anything launched during the pause gets caught right away
+            self.wake_event.set()
+            self.emit('status_changed', "Focus session in progress", uid=uid)
+            logging.info("Session resumed")
+
+    def extend_session(self, minutes, uid=ALL_USERS):
+        """Add minutes to the running session"""
+        session = self.policies.get(uid)
+        if session:
+            session.timer.extend(minutes * 60)
+            self.emit('timer_updated', *session.timer.display(), uid=uid)
+            logging.info(f"Session extended by {minutes} mins")
+
+    def tick_timers(self):
+        """Emit each session's countdown and end those past their deadline
+
+        Returns the seconds until a display changes next, or None.
+        """
+        waits = []
+        for session in self.policies:
+            timer = session.timer
+            if timer.consume_expiry():
+                self.emit('timer_updated', 0, 0, uid=session.uid)
+                self.end_session(session)
+                continue
+            display = timer.display()
+            if display != session.last_display:
+                session.last_display = display
+                self.emit('timer_updated', *display, uid=session.uid)
+            wait = timer.seconds_until_next_tick()
+            if wait is not None:
+                waits.append(wait)
+        return min(waits) if waits else None
+
+    def stop_session(self, uid=ALL_USERS):
+        """Stop focus session"""
+        session = self.policies.get(uid)
+        if session is None:
+            return "No active session"
+        return self.end_session(session)
+
+    def end_session(self, session):
+        """Remove session, stopping the monitor if it was the last one"""
+        if not self.policies.remove(session.uid, session):
+            return "No active session"
+        self.release_budgets(session)
+        self.record_session(session)
+        if not self.policies:
+            with self.monitor_lock:
+                self.stop_event.set()
+                self.wake_event.set()
+                thread = self.monitor_thread
+            # Wait for the monitor unless it is the one ending the session
+            if thread and thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+            self.thaw()
+        else:
+            self.thaw(session.uid)
+            
+        success_msg = "Session stopped"
+        self.emit('session_stopped', success_msg, uid=session.uid)
+        log_event('session_stop', uid=session.uid, remaining=round(session.timer.remaining()))
+        return success_msg
+
+    def thaw(self, uid=ANY_OWNER):
+        """Resume apps frozen for uid's session, or for every session"""
+        if self.enforcement != 'freeze':
+            return 0
+        count = self.enforcer.thaw(uid)
+        if count:
+            log_event('thaw', uid=None if uid is ANY_OWNER else uid, processes=count)
+        return count
+
+    def release_budgets(self, session):
+        """Stop session's budget clocks and save what they used"""
+        if session.budgets is not None:
+            self.snapshot.unwatch(session.budgets.on_processes)
+            session.budgets.close(time.time())
+
+    def check_budgets(self):
+        """Block apps whose budget ran out, and unblock them on a new day"""
+        now = time.time()
+        for session in self.policies:
+            budgets = session.budgets
+            if budgets is None or session.paused:
+                continue
+            changed = budgets.check(now)
+            if not changed:
+                continue
+            # The scan that follows already matches with the new rules
+            session.compile(self.app_mappings)
+            for app in sorted(changed):
+                minutes = budgets.limits[app] / 60
+                if app in budgets.exhausted:
+                    log_event('budget_exhausted', uid=session.uid, app=app, budget_mins=round(minutes, 2))
+                    self.emit('status_changed', f"{app} used its {minutes:g}-minute budget", uid=session.uid)
+                else:
+                    log_event('budget_reset', uid=session.uid, app=app, budget_mins=round(minutes, 2))
+
+    def record_session(self, session):
+        """Append a finished session to the stats history"""
+        try:
+            self.stats.record_session(session.started_at, session.timer.elapsed(), session.apps)
+        except OSError as e:
+            logging.error("Could not record session stats: %s", e)
+
+    def run_monitor(self):
+        """Run the monitor loop for the configured mode"""
+        watcher = None
+        if self.monitor_mode != 'poll':
+            from backend.proc_events import create_exec_watcher
+
+            watcher = create_exec_watcher()
+            if watcher is None:
+                logging.info("Exec notifications unsupported, falling back to polling")
+        if watcher is None:
+            self.monitor_processes()
+        else:
+            try:
+                self.monitor_exec_events(watcher)
+            finally:
+                watcher.close()
+
+    def scan_processes(self, deadline=None):
+        """Scan the full process table once and block matches"""
+        blocked_count = 0
+        try:
+            started = time.perf_counter()
+            # Single pass: index blocked names to every running PID
+            self.snapshot.refresh(deadline)
+            self.check_budgets()
+            # Every process is judged by its owner's session in the same pass
+            matches = self.policies.match_snapshot(self.snapshot)
+            self.metrics.scan_duration.observe(time.perf_counter() - started)
+            self.metrics.scan_processes.observe(len(self.snapshot))
+            
+            # Trees are terminated in the background; results arrive later
+            for session, name, pids in matches:
+                blocked_count += self.enforce(session, name, pids)
+        
+        except Exception as e:
+            logging.error("Monitoring error: %s", e)
+            self.emit('status_changed', f"Monitoring error: {e}")
+        return blocked_count
+
+    def build_process_index(self, names, deadline=None):
+        """Map each running lowercased name in names to its PIDs"""
+        if not names:
+            return {}
+        # Only PIDs that appeared since the last tick are actually read
+        self.snapshot.refresh(deadline)
+        return self.snapshot.pids_for(names)
+
+    def monitor_processes(self):
+        """Monitor and block unselected processes"""
+        logging.info("Monitoring started | Mode: poll")
+        blocked_count = 0
+        
+        next_scan = 0.0
+        
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if self.policies.all_paused():
+                next_scan = now + self.scheduler.max_interval
+            elif now >= next_scan or self.wake_event.is_set() or self.policies.pop_due():
+                self.wake_event.clear()
+                blocked = self.scan_processes(self.scheduler.tick_deadline())
+                blocked_count += blocked
+                logging.debug(
+                    "Tick: %d processes, %d new, %d blocked",
+                    len(self.snapshot), len(self.snapshot.new_pids), blocked
+                )
+                
+                # Poll faster while processes churn, back off when idle
+                next_scan = time.monotonic() + self.scheduler.next_interval(
+                    len(self.snapshot.new_pids), blocked, self.snapshot.pending
+                )
+            
+            # Wake for whichever comes first: next scan, next timer second
+            # or the end of a respawn backoff
+            wait = next_scan - time.monotonic()
+            for until in (self.tick_timers(), self.policies.next_retry()):
+                if until is not None:
+                    wait = min(wait, until)
+            self.wake_event.wait(max(0.0, wait))
+        
+        logging.info("Monitoring stopped | Total blocked: %d", blocked_count)
+
+    def monitor_exec_events(self, watcher):
+        """Block processes as soon as the kernel reports their exec"""
+        logging.info("Monitoring started | Mode: events (%s)", watcher.name)
+        # Catch anything that was already running before the session
+        blocked_count = self.scan_processes()
+        
+        while not self.stop_event.is_set():
+            timeout = 0.5
+            for until in (self.tick_timers(), self.policies.next_retry()):
+                if until is not None:
+                    timeout = min(timeout, until)
+            pids = watcher.wait_for_pids(timeout=timeout)
+            if self.policies.all_paused():
+                continue
+            # Backed-off apps are only caught again by a full scan
+            if watcher.overflowed or self.wake_event.is_set() or self.policies.pop_due():
+                watcher.overflowed = False
+                self.wake_event.clear()
+                blocked_count += self.scan_processes()
+                continue
+            for pid in pids:
+                if self.check_pid(pid):
+                    blocked_count += 1
+        
+        logging.info("Monitoring stopped | Total blocked: %d", blocked_count)
+
+    def check_pid(self, pid):
+        """Terminate a single process if it is on the block list"""
+        try:
+            session = self.policies.session_for_pid(self.snapshot, pid)
+            if session is None:
+                return False
+            name = psutil.Process(pid).name().lower()
+            if not self.policies.blocks_pid(self.snapshot, pid, name, session):
+                if session.budgets is not None and session.budgets.app_for_pid(pid, name):
+                    # Budget clocks run off the snapshot, which only a full scan refreshes
+                    self.wake_event.set()
+                return False
+            return self.enforce(session, name, [pid]) > 0
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+        except Exception as e:
+            logging.error("Exec check error for PID %d: %s", pid, e)
+            return False
+
+    def enforce(self, session, name, pids):
+        """Submit pids for termination unless name is backing off
+
+        Returns the number of trees queued. An app relaunched faster than
+        the respawn threshold has its launcher stopped once, then further
+        kills back off exponentially until it settles down.
+        """
+        respawns = session.respawns
+        if not respawns.allow_kill(name):
+            return 0
+        count = self.enforcer.submit(name, pids, owner=session.uid)
+        if count and respawns.record_kill(name, count):
+            self.escalate_respawn(session, name, pids)
+        return count
+
+    def escalate_respawn(self, session, name, pids):
+        """Stop whatever keeps relaunching name and report the storm once"""
+        respawns = session.respawns
+        rate = respawns.rate(name)
+        spare = lambda proc: self.is_spared_process(proc, session)
+        target = None
+        try:
+            launcher = find_launcher(pids, spare=spare)
+            if launcher is not None:
+                launcher_name = launcher.name().lower()
+                if self.enforcer.submit(launcher_name, [launcher.pid], owner=session.uid):
+                    target = f"launcher {launcher_name} (PID {launcher.pid})"
+            else:
+                pgid = kill_process_group(pids, spare=spare)
+                if pgid is not None:
+                    target = f"process group {pgid}"
+        except (psutil.Error, OSError) as e:
+            logging.warning("Respawn escalation failed for %s: %s", name, e)
+        log_event(
+            'respawn_storm', level=logging.WARNING, uid=session.uid, app=name, kills=rate,
+            window=respawns.window, escalated=target,
+        )
+        action = f"stopped {target}" if target else "backing off"
+        self.emit(
+            'status_changed',
+            f"{name} relaunched {rate} times in {respawns.window:g}s; {action}",
+            uid=session.uid,
+        )
+
+    def is_spared_process(self, proc, session):
+        """True if proc is allowed by session or belongs to another user"""
+        try:
+            if session.uid is not ALL_USERS and self.snapshot.owner(proc.pid) != session.uid:
+                return True
+            if session.strict:
+                name = proc.name().lower()
+                return not self.policies.blocks_pid(self.snapshot, proc.pid, name, session)
+            matcher = session.matcher
+            exe = cmdline = None
+            if matcher.allow.needs_details:
+                exe, cmdline = self.snapshot.details(proc.pid)
+            return matcher.allows(proc.name(), exe, cmdline)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            # Err on the side of sparing processes we cannot inspect
+            return True
+
+    def terminate_process(self, process_name):
+        """Terminate every process tree with the given name"""
+        name = process_name.lower()
+        try:
+            pids = self.build_process_index(frozenset([name])).get(name, [])
+            return self.enforcer.submit(name, pids) > 0
+        except Exception as e:
+            logging.error(f"Unexpected termination error: {e}")
+            return False
+
+    def on_tree_enforced(self, result):
+        """Report the outcome of one enforced process tree"""
+        metrics = self.metrics
+        for reason, count in result.failures.items():
+            metrics.kill_failures.inc(count, reason)
+        if result.success:
+            metrics.kills.inc()
+            metrics.kill_latency.observe(result.latency)
+            if result.lifetime is not None:
+                metrics.blocked_lifetime.observe(result.lifetime)
+            self.emit('app_blocked', result.name, uid=result.owner)
+            try:
+                self.stats.record_block(result.name, result.latency)
+            except OSError as e:
+                logging.error("Could not record block stats: %s", e)
+        log_event(
+            'block' if result.success else 'block_incomplete',
+            level=logging.INFO if result.success else logging.WARNING,
+            uid=result.owner, app=result.name, root_pid=result.root_pid, size=result.size,
+            latency_ms=round(result.latency * 1000, 1), terminated=result.terminated,
+            killed=result.killed, frozen=result.frozen, survivors=result.survivors,
+            failures=result.failures,
+        )
+
+    def status(self, uid=ALL_USERS):
+        """Return a JSON-serializable summary of the session governing uid"""
+        session = self.policies.session_for(uid)
+        timer = session.timer if session else None
+        return {
+            'active': session is not None,
+            'uid': session.uid if session else None,
+            'paused': bool(timer and timer.is_paused),
+            'strict': bool(session and session.strict),
+            'remaining': round(timer.remaining(), 1) if timer else 0,
+            'monitor_mode': self.monitor_mode,
+            'enforcement': self.enforcement,
+            'allowed': list(session.allowed_processes) if session else [],
+            'blocking': sorted(session.matcher.exact_names) if session else [],
+            'sessions': len(self.policies),
+            'budgets': session.budgets.usage(time.time()) if session and session.budgets else {},
+        }
+
+    def get_stats(self, days=None):
+        """Return per-day and per-app focus time and block counts
+
+        Covers the last days local days (today included), or all history.
+        Days are ISO date strings so the result is JSON-serializable.
+        """
+        start = None
+        if days is not None:
+            first = datetime.date.today() - datetime.timedelta(days=days - 1)
+            start = time.mktime(first.timetuple())
+        per_day, per_app = self.stats.query(start)
+        return {
+            'per_day': {day.isoformat(): totals for day, totals in sorted(per_day.items())},
+            'per_app': per_app,
+        }
+
+    def get_metrics(self):
+        """Return a JSON-serializable summary of the collected metrics"""
+        return self.metrics.snapshot()
+
+    def schedules(self):
+        """The schedule store, opened on first use"""
+        if self.schedule_store is None:
+            self.schedule_store = ScheduleStore()
+        return self.schedule_store
+
+    def start_scheduler(self):
+        """Start sessions from saved schedules in the background"""
+        if self.schedule_runner is None:
+            self.schedule_runner = ScheduleRunner(self.schedules(), self.start_scheduled)
+            self.schedule_runner.start()
+
+    def start_scheduled(self, schedule, minutes):
+        """Start the session for a schedule whose window just opened"""
+        if self.policies.get(schedule.uid) is not None:
+            logging.info("Schedule %r skipped: a session is already running", schedule.name)
+            return
+        log_event('schedule_due', uid=schedule.uid, schedule=schedule.name, minutes=round(minutes, 1))
+        self.start_session(schedule.apps, minutes, uid=schedule.uid)
+
+    def get_schedules(self, uid=ANY_UID):
+        """Return saved schedules as dicts, only uid's if given"""
+        return [
+            schedule.to_dict() for schedule in self.schedules().load()
+            if uid is ANY_UID or schedule.uid == uid
+        ]
+
+    def add_schedule(self, name, days, start, end, apps, uid=ALL_USERS, enabled=True, schedule_id=None):
+        """Save a recurring session and return its id
+
+        days is anything parse_days() accepts; start and end are 'HH:MM'.
+        Passing the id of an existing schedule replaces it.
+        """
+        if not apps:
+            raise ValueError("A schedule needs at least one allowed app")
+        schedule = Schedule(
+            name=name, days=parse_days(days), start=parse_time(start), end=parse_time(end),
+            apps=list(apps), uid=uid, enabled=enabled, id=schedule_id,
+        )
+        schedule_id = self.schedules().add(schedule)
+        logging.info("Saved schedule %r (%d)", name, schedule_id)
+        if self.schedule_runner is not None:
+            self.schedule_runner.reload()
+        return schedule_id
+
+    def remove_schedule(self, schedule_id, uid=ANY_UID):
+        """Delete a schedule, only if it belongs to uid when given"""
+        if not any(schedule['id'] == schedule_id for schedule in self.get_schedules(uid)):
+            return False
+        removed = self.schedules().remove(schedule_id)
+        if removed and self.schedule_runner is not None:
+            self.schedule_runner.reload()
+        return removed
+
+    def get_app_list(self):
+        """Get list of apps with display names"""
+        return list(self.app_mappings.keys())
+
+    def add_custom_app(self, display_name, process_name):
+        """Add custom app to mappings"""
+        return self.import_apps({display_name: process_name}) == 1
+
+    def import_apps(self, entries):
+        """Add or replace many mappings in one transaction
+
+        Returns the number of mappings written, or 0 on error.
+        """
+        try:
+            if isinstance(entries, dict):
+                entries = list(entries.items())
+            # Validate first so one bad rule does not abort a large import later
+            for display_name, rules in entries:
+                describe(rules)
+            mappings = self.app_mappings
+            if self.mapping_store is None:
+                self.mapping_store = MappingStore()
+            count = self.mapping_store.bulk_import(entries)
+            updated = dict(mappings)
+            updated.update(entries)
+            if len(entries) == 1:
+                logging.info(f"Added custom app: {entries[0][0]} -> {describe(entries[0][1])}")
+            else:
+                logging.info(f"Imported {count} app mappings")
+            self.on_mappings_changed(updated)
+            return count
+        except Exception as e:
+            logging.error(f"Add app error: {e}")
+            return 0
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Headless FocusGuard daemon serving a JSON-lines API on a Unix socket.
+
+Each request is one JSON object per line, e.g.
+    {"cmd": "start", "apps": ["VS Code"], "duration": 25}
+and gets one JSON reply line: {"ok": true, "result": ...}. The "subscribe"
+command keeps the connection open and streams {"event": ..., "args": [...]}
+lines until the client disconnects.
+
+With --multi-user the socket is open to every local user. Each client is
+identified by its peer credentials and controls its own session, which
+only governs processes it owns; root controls the session covering every
+user and may pass "uid" to manage someone else's.
+
+This module must never import PyQt5.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+
+from backend.core import ANY_UID, FocusGuardCore
+from backend.log_pipeline import setup_logging
+from backend.policy import ALL_USERS
+
+
+def default_socket_path():
+    """Per-user socket path under XDG_RUNTIME_DIR or the temp directory"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'focusguard.sock')
+    return os.path.join(tempfile.gettempdir(), f'focusguard-{os.getuid()}.sock')
+
+
+def peer_uid(sock):
+    """UID of the process on the other end of a Unix socket"""
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    return struct.unpack('3i', creds)[1]
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.peer = peer_uid(self.request) if self.server.multi_user else None
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                cmd = request.pop('cmd')
+            except (ValueError, KeyError, AttributeError, TypeError):
+                self.reply({'ok': False, 'error': 'Malformed request'})
+                continue
+            if cmd == 'subscribe':
+                self.stream_events()
+                return
+            self.reply(self.server.dispatch(cmd, request, self.peer))
+
+    def reply(self, message):
+        self.wfile.write(json.dumps(message).encode() + b'\n')
+        self.wfile.flush()
+
+    def stream_events(self):
+        events = queue.Queue()
+        listeners = {
+            event: (lambda *args, event=event: events.put({'event': event, 'args': list(args)}))
+            for event in FocusGuardCore.EVENTS
+        }
+        core = self.server.core
+        # Users only hear about their own session and global events
+        uid = ANY_UID if self.peer in (None, 0) else self.peer
+        for event, callback in listeners.items():
+            core.subscribe(event, callback, uid=uid)
+        try:
+            self.reply({'ok': True, 'result': 'subscribed'})
+            while not self.server.shutting_down:
+                try:
+                    message = events.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                self.reply(message)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            for event, callback in listeners.items():
+                core.unsubscribe(event, callback)
+
+
+class FocusGuardDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, core=None, multi_user=False):
+        if multi_user and not hasattr(socket, 'SO_PEERCRED'):
+            raise OSError("Multi-user mode needs SO_PEERCRED peer credentials")
+        self.core = core or FocusGuardCore()
+        self.socket_path = socket_path
+        self.multi_user = multi_user
+        self.shutting_down = False
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        # Only the owning user may talk to the daemon, unless it serves everyone
+        old_umask = os.umask(0o111 if multi_user else 0o177)
+        try:
+            super().__init__(socket_path, RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def session_uid(self, peer, args):
+        """Which session a request from peer acts on"""
+        uid = args.pop('uid', ALL_USERS)
+        if peer is None or peer == 0:
+            return uid
+        if uid not in (ALL_USERS, peer):
+            raise PermissionError("Only root may manage other users' sessions")
+        return peer
+
+    def dispatch(self, cmd, args, peer=None):
+        """Run one command for the client with UID peer and build its reply"""
+        try:
+            uid = self.session_uid(peer, args)
+            if cmd == 'start':
+                apps = args.pop('apps')
+                duration = args.pop('duration')
+                message = self.core.start_session(apps, duration, uid=uid, **args)
+                return {'ok': self.core.policies.get(uid) is not None, 'result': message}
+            if cmd == 'stop':
+                return {'ok': True, 'result': self.core.stop_session(uid)}
+            if cmd == 'status':
+                return {'ok': True, 'result': self.core.status(uid)}
+            if cmd == 'metrics':
+                return {'ok': True, 'result': self.core.get_metrics()}
+            if cmd == 'stats':
+                return {'ok': True, 'result': self.core.get_stats(args.get('days'))}
+            if cmd == 'list-apps':
+                return {'ok': True, 'result': self.core.get_app_list()}
+            if cmd == 'list-schedules':
+                scope = ANY_UID if peer in (None, 0) else uid
+                return {'ok': True, 'result': self.core.get_schedules(scope)}
+            if cmd == 'add-schedule':
+                schedule_id = self.core.add_schedule(
+                    args['name'], args['days'], args['start'], args['end'], args['apps'],
+                    uid=uid, schedule_id=args.get('id'),
+                )
+                return {'ok': True, 'result': schedule_id}
+            if cmd == 'remove-schedule':
+                scope = ANY_UID if peer in (None, 0) else uid
+                removed = self.core.remove_schedule(args['id'], scope)
+                return {'ok': removed, 'result': removed}
+            if cmd in ('add-app', 'import-apps') and peer not in (None, 0, os.getuid()):
+                raise PermissionError("Only the daemon's owner may change app mappings")
+            if cmd == 'add-app':
+                added = self.core.add_custom_app(args['name'], args['process'])
+                return {'ok': added, 'result': added}
+            if cmd == 'import-apps':
+                count = self.core.import_apps(args['entries'])
+                return {'ok': count > 0, 'result': count}
+            if cmd in ('pause', 'resume'):
+                getattr(self.core, f'{cmd}_session')(uid)
+                return {'ok': True, 'result': self.core.status(uid)}
+            if cmd == 'extend':
+                self.core.extend_session(args['minutes'], uid)
+                return {'ok': True, 'result': self.core.status(uid)}
+            return {'ok': False, 'error': f'Unknown command: {cmd}'}
+        except PermissionError as e:
+            return {'ok': False, 'error': str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {'ok': False, 'error': f'Bad arguments for {cmd}: {e}'}
+        except Exception as e:
+            logging.error(f"Daemon command error ({cmd}): {e}")
+            return {'ok': False, 'error': str(e)}
+
+    def server_close(self):
+        self.shutting_down = True
+        for session in self.core.policies:
+            self.core.end_session(session)
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run FocusGuard without a GUI")
+    parser.add_argument('--socket', default=default_socket_path(), help="Unix socket path")
+    parser.add_argument('--monitor-mode', default='auto', choices=FocusGuardCore.MONITOR_MODES)
+    parser.add_argument('--enforcement', default='kill', choices=FocusGuardCore.ENFORCEMENT_MODES,
+                        help="Terminate blocked apps, or freeze them until the session ends")
+    parser.add_argument('--log-file', default='focusguard-daemon.log')
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    parser.add_argument('--metrics', nargs='?', const=0, type=int, metavar='PORT',
+                        help="Collect metrics, and serve them on localhost:PORT/metrics if given")
+    parser.add_argument('--multi-user', action='store_true',
+                        help="Accept every local user, each controlling their own session")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.log_file, level=getattr(logging, args.log_level))
+
+    metrics = None
+    if args.metrics is not None:
+        from backend.metrics import Metrics, serve
+        metrics = Metrics()
+        if args.metrics:
+            serve(metrics, args.metrics)
+
+    core = FocusGuardCore(monitor_mode=args.monitor_mode, metrics=metrics, enforcement=args.enforcement)
+    server = FocusGuardDaemon(args.socket, core, multi_user=args.multi_user)
+    core.start_scheduler()
+    logging.info(f"Daemon listening on {args.socket}")
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
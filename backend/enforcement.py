@@ -0,0 +1,191 @@
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+
+import psutil
+
+
+@dataclass
+class TreeResult:
+    """Outcome of enforcing one process tree"""
+    name: str
+    root_pid: int
+    size: int
+    terminated: int = 0
+    killed: int = 0
+    frozen: int = 0
+    survivors: int = 0
+    failures: dict = field(default_factory=dict)
+    latency: float = 0.0
+    lifetime: float = None  # seconds the root ran before it was enforced
+    owner: object = None    # uid of the session that asked for it
+
+    @property
+    def success(self):
+        return self.size > 0 and self.survivors == 0
+
+
+class TreeEnforcer:
+    """Terminate whole process trees off the monitor thread.
+
+    Each tree gets SIGTERM in bulk, is waited on with psutil.wait_procs for
+    grace_period seconds and whatever is still alive gets SIGKILL. PIDs that
+    are already being enforced are not submitted again.
+    """
+
+    # Longest single psutil.wait_procs call before zombies are re-checked
+    WAIT_SLICE = 0.1
+
+    def __init__(self, grace_period=3.0, kill_timeout=1.0, on_result=None, max_workers=4):
+        self.grace_period = grace_period
+        self.kill_timeout = kill_timeout
+        self.on_result = on_result
+        self.max_workers = max_workers
+        self.executor = None
+        self.in_flight = set()
+        self.lock = threading.Lock()
+
+    def submit(self, name, pids, owner=None):
+        """Queue the trees rooted at pids and return how many were queued"""
+        with self.lock:
+            fresh = [pid for pid in pids if pid not in self.in_flight]
+            if not fresh:
+                return 0
+            self.in_flight.update(fresh)
+            if self.executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='enforcer'
+                )
+        roots = self.find_roots(fresh)
+        # Matched PIDs inside another matched tree are handled with that tree
+        self.release(set(fresh) - set(roots))
+        for pid in roots:
+            self.executor.submit(self.enforce_tree, name, pid, time.monotonic(), owner)
+        return len(roots)
+
+    @staticmethod
+    def find_roots(pids):
+        """Drop zombies and PIDs whose ancestor is also in pids"""
+        matched = set(pids)
+        roots = []
+        for pid in pids:
+            try:
+                proc = psutil.Process(pid)
+                if proc.status() == psutil.STATUS_ZOMBIE:
+                    continue
+                parents = proc.parents()
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            except psutil.AccessDenied:
+                parents = []
+            if not any(parent.pid in matched for parent in parents):
+                roots.append(pid)
+        return roots
+
+    def enforce_tree(self, name, root_pid, detected_at, owner=None):
+        """Terminate, wait and kill one tree, then report the outcome"""
+        result = TreeResult(name=name, root_pid=root_pid, size=0, owner=owner)
+        tree_pids = {root_pid}
+        try:
+            procs = self.collect_tree(root_pid)
+            if procs:
+                try:
+                    result.lifetime = max(0.0, time.time() - procs[0].create_time())
+                except psutil.Error:
+                    pass
+            tree_pids.update(proc.pid for proc in procs)
+            with self.lock:
+                self.in_flight.update(tree_pids)
+            result.size = len(procs)
+            self.stop_tree(procs, result)
+        except Exception as e:
+            logging.error("Enforcement error for %s (PID: %d): %s", name, root_pid, e)
+            self.count_failure(result, e)
+        finally:
+            result.latency = time.monotonic() - detected_at
+            self.release(tree_pids)
+
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    def stop_tree(self, procs, result):
+        """Terminate procs, killing whatever outlives the grace period"""
+        signalled = self.signal_all(procs, 'terminate', result)
+        alive = self.wait_all(signalled, self.grace_period)
+        result.terminated = len(signalled) - len(alive)
+
+        if alive:
+            signalled = self.signal_all(alive, 'kill', result)
+            alive = self.wait_all(signalled, self.kill_timeout)
+            result.killed = len(signalled) - len(alive)
+        # Includes processes we were not allowed to signal at all
+        result.survivors = sum(1 for proc in procs if self.is_alive(proc))
+
+    @staticmethod
+    def collect_tree(root_pid):
+        """Return the root process followed by all of its descendants"""
+        try:
+            root = psutil.Process(root_pid)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return []
+        try:
+            children = root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            children = []
+        return [root] + children
+
+    def signal_all(self, procs, action, result):
+        """Send terminate/kill to every process, returning those signalled"""
+        signalled = []
+        for proc in procs:
+            try:
+                getattr(proc, action)()
+                signalled.append(proc)
+            except psutil.NoSuchProcess as e:
+                # Already gone counts as done, but the race is still counted
+                self.count_failure(result, e)
+                continue
+            except (psutil.AccessDenied, psutil.ZombieProcess) as e:
+                self.count_failure(result, e)
+        return signalled
+
+    def wait_all(self, procs, timeout):
+        """Wait for procs to exit and return the ones still alive
+
+        Zombies count as exited: their parent may never reap them, and
+        psutil.wait_procs would otherwise hold the tree for the full timeout.
+        """
+        deadline = time.monotonic() + timeout
+        alive = procs
+        while alive:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _, alive = psutil.wait_procs(alive, timeout=min(remaining, self.WAIT_SLICE))
+            alive = [proc for proc in alive if self.is_alive(proc)]
+        return alive
+
+    @staticmethod
+    def is_alive(proc):
+        try:
+            return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    @staticmethod
+    def count_failure(result, error):
+        key = type(error).__name__
+        result.failures[key] = result.failures.get(key, 0) + 1
+
+    def release(self, pids):
+        with self.lock:
+            self.in_flight.difference_update(pids)
+
+    def shutdown(self, wait=False):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class EventAggregator:
+    """Coalesce high-rate monitor events into per-frame summaries.
+
+    Producer threads record events cheaply under a lock; the UI drains one
+    summary per frame. Block events become per-app counts with a last-seen
+    time, and only the newest timer value is kept.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.blocks = {}   # name -> [count, last seen]
+        self.timer = None
+        self.last_timer = None
+        self.blocks_dirty = False
+        self.pending = False
+
+    def record_block(self, name):
+        """Count one block; returns True if a flush should be scheduled"""
+        with self.lock:
+            entry = self.blocks.get(name)
+            if entry is None:
+                self.blocks[name] = [1, time.time()]
+            else:
+                entry[0] += 1
+                entry[1] = time.time()
+            self.blocks_dirty = True
+            return self._schedule()
+
+    def record_timer(self, minutes, seconds):
+        """Keep the newest timer value; returns True if a flush should be scheduled"""
+        with self.lock:
+            self.timer = (minutes, seconds)
+            return self._schedule()
+
+    def _schedule(self):
+        if self.pending:
+            return False
+        self.pending = True
+        return True
+
+    def drain(self):
+        """Return (blocks summary or None, timer value or None) since the last drain
+
+        The blocks summary covers the whole session, {name: (count, last seen)},
+        and is only returned when it changed. The timer value is only returned
+        when it differs from the last one drained.
+        """
+        with self.lock:
+            self.pending = False
+            blocks = None
+            if self.blocks_dirty:
+                self.blocks_dirty = False
+                blocks = {name: tuple(entry) for name, entry in self.blocks.items()}
+            timer = None
+            if self.timer is not None and self.timer != self.last_timer:
+                timer = self.last_timer = self.timer
+            return blocks, timer
+
+    def reset(self):
+        """Start a new session's counts; returns True if a flush should be scheduled"""
+        with self.lock:
+            self.blocks.clear()
+            self.blocks_dirty = True
+            # Keep the pending timer value but let it be delivered again
+            self.last_timer = None
+            return self._schedule()
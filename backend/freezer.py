@@ -0,0 +1,245 @@
+import atexit
+import json
+import os
+import threading
+import logging
+from pathlib import Path
+
+import psutil
+
+from backend.enforcement import TreeEnforcer
+
+DEFAULT_STATE_PATH = Path(__file__).parent / 'frozen.json'
+CGROUP_PREFIX = 'focusguard-frozen'
+
+# thaw() argument that selects every owner's processes
+ANY_OWNER = object()
+
+
+def cgroup2_mount():
+    """Where the cgroup v2 hierarchy is mounted, or None"""
+    try:
+        with open('/proc/self/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == 'cgroup2':
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+
+def cgroup_of(pid='self'):
+    """cgroup v2 path of pid relative to the hierarchy's mount, or None"""
+    try:
+        with open(f'/proc/{pid}/cgroup') as f:
+            for line in f:
+                hierarchy, _, path = line.rstrip('\n').split(':', 2)
+                if hierarchy == '0':
+                    return path
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def write_value(path, value):
+    with open(path, 'w') as f:
+        f.write(str(value))
+
+
+def same_process(proc, record):
+    """False if record's PID now belongs to a different process"""
+    return round(proc.create_time(), 2) == round(record['create_time'], 2)
+
+
+def thaw_records(records):
+    """Resume the processes described by records and return how many"""
+    cgroups = {record['cgroup'] for record in records if record['cgroup']}
+    # One write releases a whole freezer group
+    for cgroup in cgroups:
+        try:
+            write_value(os.path.join(cgroup, 'cgroup.freeze'), 0)
+        except OSError as e:
+            logging.warning("Could not thaw cgroup %s: %s", cgroup, e)
+    count = 0
+    for record in records:
+        try:
+            proc = psutil.Process(record['pid'])
+            if not same_process(proc, record):
+                continue
+            if record['cgroup'] is None:
+                proc.resume()
+            elif record['origin']:
+                try:
+                    write_value(os.path.join(record['origin'], 'cgroup.procs'), proc.pid)
+                except OSError:
+                    # Still thawed, it just stays in the freezer group
+                    pass
+            count += 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    for cgroup in cgroups:
+        try:
+            os.rmdir(cgroup)
+        except OSError:
+            pass
+    return count
+
+
+def thaw_leftovers(state_path=DEFAULT_STATE_PATH):
+    """Thaw whatever a previous run left frozen, e.g. after a crash"""
+    try:
+        with open(state_path) as f:
+            records = json.load(f)['processes']
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError, KeyError) as e:
+        logging.error("Unreadable freezer state %s: %s", state_path, e)
+        return 0
+    count = thaw_records(records)
+    logging.info("Thawed %d processes left frozen by a previous run", count)
+    try:
+        os.unlink(state_path)
+    except OSError:
+        pass
+    return count
+
+
+class TreeFreezer(TreeEnforcer):
+    """Freeze whole process trees instead of terminating them.
+
+    Trees are moved into a frozen cgroup v2 group per session owner when
+    the hierarchy is writable, and suspended (SIGSTOP, or NtSuspendProcess
+    on Windows) otherwise. A frozen app keeps its state and resumes
+    instantly when thawed.
+
+    Every frozen process is recorded in a state file before it is frozen,
+    rewritten atomically on each change, so thaw_leftovers() can release
+    what a crashed run left behind. A normal exit thaws everything.
+    """
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH, on_result=None, max_workers=4):
+        super().__init__(on_result=on_result, max_workers=max_workers)
+        self.state_path = Path(state_path)
+        self.frozen = {}        # pid -> record, as stored in the state file
+        self.cgroups = {}       # owner -> freezer group directory or None
+        self.thaws = {}         # owner -> thaw count, ANY_OWNER for thaw-all
+        self.save_lock = threading.Lock()
+        self.mount = cgroup2_mount()
+        own = cgroup_of()
+        if self.mount and own:
+            # A sibling of our own group, which holds processes of its own
+            self.cgroup_parent = os.path.join(self.mount, os.path.dirname(own).lstrip('/'))
+        else:
+            self.cgroup_parent = None
+        atexit.register(self.thaw)
+
+    def submit(self, name, pids, owner=None):
+        """Queue the trees rooted at pids that are not frozen already"""
+        with self.lock:
+            pids = [pid for pid in pids if pid not in self.frozen]
+        return super().submit(name, pids, owner)
+
+    def freezer_group(self, owner):
+        """Frozen cgroup for owner's processes, or None to fall back to SIGSTOP"""
+        with self.lock:
+            if owner in self.cgroups:
+                return self.cgroups[owner]
+            path = None
+            if self.cgroup_parent:
+                suffix = 'all' if owner is None else owner
+                path = os.path.join(self.cgroup_parent, f'{CGROUP_PREFIX}-{suffix}')
+                try:
+                    os.makedirs(path, exist_ok=True)
+                    # cgroup.freeze exists from Linux 5.2
+                    write_value(os.path.join(path, 'cgroup.freeze'), 1)
+                except OSError as e:
+                    logging.info("cgroup freezer unavailable, using SIGSTOP: %s", e)
+                    path = None
+            self.cgroups[owner] = path
+            return path
+
+    def stop_tree(self, procs, result):
+        """Freeze procs, recording them before they stop"""
+        owner = result.owner
+        cgroup = self.freezer_group(owner)
+        with self.lock:
+            thaws = (self.thaws.get(ANY_OWNER, 0), self.thaws.get(owner, 0))
+        entries = []
+        for proc in procs:
+            try:
+                origin = cgroup_of(proc.pid) if cgroup else None
+                entries.append((proc, {
+                    'pid': proc.pid, 'create_time': proc.create_time(), 'owner': result.owner,
+                    'cgroup': cgroup, 'origin': origin and os.path.join(self.mount, origin.lstrip('/')),
+                }))
+            except psutil.Error as e:
+                self.count_failure(result, e)
+        with self.lock:
+            self.frozen.update((proc.pid, record) for proc, record in entries)
+        self.save()
+
+        frozen = set()
+        for proc, record in entries:
+            try:
+                if record['cgroup']:
+                    try:
+                        write_value(os.path.join(record['cgroup'], 'cgroup.procs'), proc.pid)
+                    except OSError:
+                        # Not allowed to move this one; stop it directly instead
+                        record['cgroup'] = record['origin'] = None
+                if record['cgroup'] is None:
+                    proc.suspend()
+                frozen.add(proc.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+                self.count_failure(result, e)
+                with self.lock:
+                    self.frozen.pop(proc.pid, None)
+        with self.lock:
+            # The session was stopped while this tree was being frozen
+            stale = thaws != (self.thaws.get(ANY_OWNER, 0), self.thaws.get(owner, 0))
+            if stale:
+                for pid in frozen:
+                    self.frozen.pop(pid, None)
+        if stale:
+            thaw_records([record for proc, record in entries if proc.pid in frozen])
+        self.save()
+        result.frozen = len(frozen)
+        result.survivors = sum(1 for proc in procs if proc.pid not in frozen and self.is_alive(proc))
+
+    def thaw(self, owner=ANY_OWNER):
+        """Resume every frozen process, or only owner's; returns how many"""
+        with self.lock:
+            records = [
+                record for record in self.frozen.values()
+                if owner is ANY_OWNER or record['owner'] == owner
+            ]
+            for record in records:
+                del self.frozen[record['pid']]
+            self.thaws[owner] = self.thaws.get(owner, 0) + 1
+            # Thawed groups are removed; the next freeze recreates them
+            for key in [key for key in self.cgroups if owner is ANY_OWNER or key == owner]:
+                del self.cgroups[key]
+        if not records:
+            return 0
+        count = thaw_records(records)
+        self.save()
+        return count
+
+    def save(self):
+        """Atomically rewrite the state file, removing it once nothing is frozen"""
+        with self.save_lock:
+            with self.lock:
+                records = list(self.frozen.values())
+            if not records:
+                try:
+                    os.unlink(self.state_path)
+                except FileNotFoundError:
+                    pass
+                return
+            temp_path = self.state_path.with_suffix('.tmp')
+            with open(temp_path, 'w') as f:
+                json.dump({'processes': records}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.state_path)
@@ -0,0 +1,99 @@
+"""Non-blocking logging for FocusGuard.
+
+Log calls only put the record on an in-memory queue; a QueueListener thread
+does the formatting and the (rotating) file I/O. Records logged through
+log_event() are also written as compact JSON lines to a separate file.
+"""
+import atexit
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+logger = logging.getLogger('focusguard')
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats the message in the logging thread. Here the
+    record is queued untouched, so callers must not mutate objects passed as
+    log arguments afterwards (the hot path only passes strings and numbers).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class EventMessage:
+    """Log message rendered only when a handler actually formats it"""
+
+    __slots__ = ('event', 'fields')
+
+    def __init__(self, event, fields):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self):
+        details = ' '.join(f'{key}={value}' for key, value in self.fields.items())
+        return f'{self.event} {details}' if details else self.event
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'event': record.event,
+        }
+        entry.update(record.fields)
+        return json.dumps(entry, separators=(',', ':'), default=str)
+
+
+class EventFilter(logging.Filter):
+    """Pass only records created through log_event()"""
+
+    def filter(self, record):
+        return hasattr(record, 'event')
+
+
+def setup_logging(path='focusguard.log', level=logging.INFO, events_path=None,
+                  max_bytes=5 * 1024 * 1024, backup_count=3):
+    """Route all logging through a queue to rotating text and event files
+
+    Returns the running QueueListener; it is stopped automatically at exit.
+    """
+    text_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+    text_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    if events_path is None:
+        events_path = str(path).rsplit('.', 1)[0] + '.events.jsonl'
+    event_handler = RotatingFileHandler(events_path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+    event_handler.setFormatter(JsonLinesFormatter())
+    event_handler.addFilter(EventFilter())
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, text_handler, event_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def log_event(event, level=logging.INFO, **fields):
+    """Log a structured event; skipped entirely when level is disabled"""
+    if logger.isEnabledFor(level):
+        logger.log(level, EventMessage(event, fields), extra={'event': event, 'fields': fields})
+
+
+def debug_enabled():
+    """Cheap guard for building expensive DEBUG messages"""
+    return logger.isEnabledFor(logging.DEBUG)
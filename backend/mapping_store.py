@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+
+DEFAULT_DB_PATH = Path(__file__).parent / 'process_map.db'
+DEFAULT_SEED_PATH = Path(__file__).parent / 'process_map.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mappings (
+    display_name TEXT PRIMARY KEY,
+    rules TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class MappingStore:
+    """App mappings kept in SQLite so every write is a small atomic commit.
+
+    An empty store is seeded from process_map.json. The JSON file stays an
+    import source: external edits to it are merged in by MappingWatcher.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, seed_path=DEFAULT_SEED_PATH):
+        self.path = str(path)
+        self.seed_path = Path(seed_path) if seed_path else None
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(SCHEMA)
+        if self.seed_path and self.count() == 0 and self.seed_path.exists():
+            self.import_json(self.seed_path)
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM mappings').fetchone()[0]
+
+    def load(self):
+        """Return all mappings as {display name: rules}, oldest first"""
+        with self.lock:
+            rows = self.conn.execute('SELECT display_name, rules FROM mappings ORDER BY rowid').fetchall()
+        return {display: json.loads(rules) for display, rules in rows}
+
+    def add(self, display_name, rules):
+        """Insert or replace one mapping"""
+        return self.bulk_import({display_name: rules})
+
+    def remove(self, display_name):
+        with self.lock, self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            cursor = self.conn.execute('DELETE FROM mappings WHERE display_name = ?', (display_name,))
+        return cursor.rowcount > 0
+
+    def bulk_import(self, entries):
+        """Upsert many mappings in one transaction and return how many
+
+        entries is a dict or an iterable of (display name, rules) pairs.
+        """
+        if isinstance(entries, dict):
+            entries = entries.items()
+        now = time.time()
+        rows = [(str(display), json.dumps(rules), now) for display, rules in entries]
+        with self.lock, self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            self.conn.executemany(
+                'INSERT INTO mappings (display_name, rules, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(display_name) DO UPDATE SET rules = excluded.rules, updated = excluded.updated',
+                rows,
+            )
+        return len(rows)
+
+    def import_json(self, path):
+        with open(path, 'r') as f:
+            mappings = json.load(f)
+        count = self.bulk_import(mappings)
+        logging.info("Imported %d app mappings from %s", count, path)
+        return count
+
+    def data_version(self):
+        """Changes whenever another connection commits to the database"""
+        with self.lock:
+            return self.conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class MappingWatcher(threading.Thread):
+    """Poll for external edits and report the reloaded mappings.
+
+    Watches both the database (via PRAGMA data_version, a cheap in-memory
+    check) and the seed JSON file's mtime, which is merged into the store
+    when it changes.
+    """
+
+    def __init__(self, store, on_change, interval=1.0):
+        super().__init__(daemon=True, name='mapping-watcher')
+        self.store = store
+        self.on_change = on_change
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.version = store.data_version()
+        self.seed_mtime = self._seed_mtime()
+
+    def _seed_mtime(self):
+        try:
+            return os.stat(self.store.seed_path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                changed = False
+                mtime = self._seed_mtime()
+                if mtime != self.seed_mtime:
+                    self.seed_mtime = mtime
+                    if mtime is not None:
+                        self.store.import_json(self.store.seed_path)
+                        changed = True
+                version = self.store.data_version()
+                if version != self.version:
+                    self.version = version
+                    changed = True
+                if changed:
+                    self.on_change(self.store.load())
+            except Exception as e:
+                logging.error("Mapping watcher error: %s", e)
+
+    def stop(self):
+        self.stop_event.set()
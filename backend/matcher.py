@@ -0,0 +1,220 @@
+"""Compile process_map.json rules into one matcher.
+
+A mapping value may be:
+    "chrome.exe"                                exact process name
+    {"glob": "steam*"}                          shell glob on the name
+    {"regex": "^disc(or)?d"}                    regex searched in the name
+    {"exe": "/opt/slack/*"}                     exact path or glob on the executable
+    {"cmdline": "--app=youtube"}                substring of the command line
+    {"name": ..., "glob": [...], ...}           any mix; each key takes a string or a list
+    ["a.exe", {"glob": "b*"}]                   a list of the above
+
+All comparisons are case-insensitive. Exact names become one hash set, name
+globs and regexes become one combined regex, exe globs another, and cmdline
+substrings an Aho-Corasick automaton, so the cost per process does not grow
+with the number of rules.
+"""
+import fnmatch
+import re
+from collections import deque
+
+RULE_KINDS = ('name', 'glob', 'regex', 'exe', 'cmdline')
+
+
+def iter_rules(value):
+    """Yield (kind, pattern) pairs from one mapping value"""
+    if isinstance(value, str):
+        yield 'name', value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from iter_rules(item)
+    elif isinstance(value, dict):
+        for kind, patterns in value.items():
+            if kind not in RULE_KINDS:
+                raise ValueError(f"Unknown rule type: {kind}")
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            for pattern in patterns:
+                yield kind, pattern
+    else:
+        raise ValueError(f"Invalid rule: {value!r}")
+
+
+def describe(value):
+    """Short human-readable form of one mapping value"""
+    return ', '.join(
+        pattern if kind == 'name' else f'{kind}:{pattern}' for kind, pattern in iter_rules(value)
+    )
+
+
+class SubstringAutomaton:
+    """Aho-Corasick automaton answering "does text contain any pattern"."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.terminal = [False]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern.lower())
+        self._build()
+
+    def _add(self, pattern):
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.terminal.append(False)
+            state = nxt
+        self.terminal[state] = True
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.terminal[nxt] = self.terminal[nxt] or self.terminal[self.fail[nxt]]
+
+    def __bool__(self):
+        return len(self.goto) > 1
+
+    def search(self, text):
+        goto, fail, terminal = self.goto, self.fail, self.terminal
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+def _combine(patterns):
+    """One case-insensitive regex searching for any of the given patterns"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+class RuleSet:
+    """Compiled form of a collection of mapping values"""
+
+    def __init__(self, values):
+        names, name_patterns, exe_paths, exe_patterns, cmdlines = set(), [], set(), [], []
+        for value in values:
+            for kind, pattern in iter_rules(value):
+                if kind == 'name':
+                    names.add(pattern.lower())
+                elif kind == 'glob':
+                    name_patterns.append('^' + fnmatch.translate(pattern.lower()))
+                elif kind == 'regex':
+                    re.compile(pattern)  # report bad rules individually
+                    name_patterns.append(pattern)
+                elif kind == 'exe':
+                    if any(char in pattern for char in '*?['):
+                        exe_patterns.append('^' + fnmatch.translate(pattern.lower()))
+                    else:
+                        exe_paths.add(pattern.lower())
+                else:
+                    cmdlines.append(pattern)
+        self.names = frozenset(names)
+        self.name_regex = _combine(name_patterns)
+        self.exe_paths = frozenset(exe_paths)
+        self.exe_regex = _combine(exe_patterns)
+        self.cmdline = SubstringAutomaton(cmdlines)
+
+    @property
+    def needs_details(self):
+        """True if matching needs the executable path or command line"""
+        return bool(self.exe_paths or self.exe_regex or self.cmdline)
+
+    def match_name(self, name):
+        return name in self.names or bool(self.name_regex and self.name_regex.search(name))
+
+    def match_details(self, exe, cmdline):
+        if exe:
+            exe = exe.lower()
+            if exe in self.exe_paths or (self.exe_regex and self.exe_regex.search(exe)):
+                return True
+        return bool(cmdline and self.cmdline and self.cmdline.search(cmdline))
+
+
+class ProcessMatcher:
+    """Block rules minus allow rules, with verdicts cached per name and PID.
+
+    Allow rules win, so picking "Chrome" keeps chrome.exe running even if
+    the unselected "YouTube" maps to the same executable.
+    """
+
+    def __init__(self, block_values, allow_values=()):
+        self.block = RuleSet(block_values)
+        self.allow = RuleSet(allow_values)
+        # Exact names that can be looked up directly in the snapshot index
+        self.exact_names = frozenset(
+            name for name in self.block.names if not self.allow.match_name(name)
+        )
+        self.has_patterns = self.block.name_regex is not None
+        self.needs_details = self.block.needs_details
+        self.name_verdicts = {}
+        self.pid_verdicts = {}  # pid -> (create_time, verdict)
+
+    def match(self, name, exe=None, cmdline=None):
+        """Return True if a process with these attributes should be blocked"""
+        name = name.lower()
+        blocked = self.block.match_name(name) or (
+            self.needs_details and self.block.match_details(exe, cmdline)
+        )
+        if not blocked:
+            return False
+        return not (self.allow.match_name(name) or self.allow.match_details(exe, cmdline))
+
+    def allows(self, name, exe=None, cmdline=None):
+        """Return True if the allow rules cover a process with these attributes"""
+        name = name.lower()
+        return self.allow.match_name(name) or self.allow.match_details(exe, cmdline)
+
+    def match_name(self, name):
+        verdict = self.name_verdicts.get(name)
+        if verdict is None:
+            verdict = self.block.match_name(name) and not self.allow.match_name(name)
+            self.name_verdicts[name] = verdict
+        return verdict
+
+    def match_snapshot(self, snapshot):
+        """Map each blocked process name in the snapshot to its PIDs"""
+        index = snapshot.pids_for(self.exact_names)
+        if self.has_patterns:
+            for name, pids in snapshot.name_items():
+                if name not in index and self.match_name(name):
+                    index[name] = pids
+        if self.needs_details:
+            self._match_details(snapshot, index)
+        return index
+
+    def _match_details(self, snapshot, index):
+        verdicts = {}
+        for pid, (create_time, name) in snapshot.items():
+            cached = self.pid_verdicts.get(pid)
+            if cached is not None and cached[0] == create_time:
+                verdict = cached[1]
+            else:
+                exe, cmdline = snapshot.details(pid)
+                verdict = self.block.match_details(exe, cmdline) and not (
+                    self.allow.match_name(name) or self.allow.match_details(exe, cmdline)
+                )
+            verdicts[pid] = (create_time, verdict)
+            if verdict and pid not in index.get(name, ()):
+                index.setdefault(name, []).append(pid)
+        # Rebuilt each pass so dead PIDs do not accumulate
+        self.pid_verdicts = verdicts
@@ -0,0 +1,197 @@
+import bisect
+import threading
+import logging
+
+# Bucket upper bounds in seconds (or processes) for each histogram
+SCAN_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+PROCESS_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+LIFETIME_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0, 3600.0)
+
+
+class Counter:
+    """Monotonic count, optionally split by one label"""
+
+    def __init__(self, name, help, label=None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, label_value=None):
+        with self.lock:
+            self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def total(self):
+        with self.lock:
+            return sum(self.values.values())
+
+    def snapshot(self):
+        with self.lock:
+            if self.label is None:
+                return self.values.get(None, 0)
+            return dict(self.values)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self.lock:
+            values = dict(self.values) or {None: 0}
+        for label_value, value in sorted(values.items(), key=lambda item: str(item[0])):
+            if self.label is None or label_value is None:
+                lines.append(f'{self.name} {value}')
+            else:
+                lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value}')
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)   # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q):
+        """Estimate the q-quantile by interpolating within its bucket"""
+        with self.lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0.0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+    def snapshot(self):
+        with self.lock:
+            count, total = self.count, self.sum
+        return {
+            'count': count,
+            'mean': total / count if count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+    def render(self):
+        with self.lock:
+            counts, count, total = list(self.counts), self.count, self.sum
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        cumulative = 0
+        for bound, bucket in zip(self.bounds, counts):
+            cumulative += bucket
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f'{self.name}_sum {total}')
+        lines.append(f'{self.name}_count {count}')
+        return lines
+
+
+class Metrics:
+    """Counters and histograms for the monitor and enforcement loop"""
+
+    enabled = True
+
+    def __init__(self):
+        self.scan_duration = Histogram(
+            'focusguard_scan_duration_seconds', 'Wall time of one process table scan', SCAN_BUCKETS)
+        self.scan_processes = Histogram(
+            'focusguard_scan_processes', 'Processes in the table per scan', PROCESS_BUCKETS)
+        self.kills = Counter('focusguard_kills_total', 'Blocked process trees terminated')
+        self.kill_failures = Counter(
+            'focusguard_kill_failures_total', 'Errors while signalling blocked processes', label='reason')
+        self.kill_latency = Histogram(
+            'focusguard_kill_latency_seconds', 'Detection to termination of a blocked process tree',
+            LATENCY_BUCKETS)
+        self.blocked_lifetime = Histogram(
+            'focusguard_blocked_lifetime_seconds', 'How long a blocked app ran before it was killed',
+            LIFETIME_BUCKETS)
+        self.sessions = Counter('focusguard_sessions_total', 'Focus sessions started')
+
+    def all(self):
+        return [
+            self.scan_duration, self.scan_processes, self.kills, self.kill_failures,
+            self.kill_latency, self.blocked_lifetime, self.sessions,
+        ]
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.all():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """JSON-serializable summary for the diagnostics panel"""
+        return {'enabled': True, **{
+            metric.name.replace('focusguard_', ''): metric.snapshot() for metric in self.all()
+        }}
+
+
+class _NullMetric:
+    def inc(self, amount=1, label_value=None):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+class NullMetrics:
+    """Stand-in used when metrics are disabled; every update is a no-op"""
+
+    enabled = False
+
+    def __init__(self):
+        self.scan_duration = self.scan_processes = self.kills = self.kill_failures = _NullMetric()
+        self.kill_latency = self.blocked_lifetime = self.sessions = _NullMetric()
+
+    def render(self):
+        return ''
+
+    def snapshot(self):
+        return {'enabled': False}
+
+
+def serve(metrics, port, host='127.0.0.1'):
+    """Serve metrics.render() at http://host:port/metrics from a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.debug("Metrics request: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True, name='metrics-http')
+    thread.start()
+    logging.info("Serving metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
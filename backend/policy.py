@@ -0,0 +1,240 @@
+import threading
+import time
+
+from backend.allowlist import ExecutableClassifier
+from backend.matcher import ProcessMatcher, describe
+from backend.session_timer import SessionTimer
+
+# uid of the session that applies to every user without a session of their own
+ALL_USERS = None
+
+
+class UserSession:
+    """One focus session: its owner's rules, countdown and respawn tracking"""
+
+    def __init__(self, uid, apps, duration_seconds, respawns, strict=False):
+        self.uid = uid
+        self.apps = list(apps)
+        # Strict sessions block every user process the apps do not allow
+        self.strict = strict
+        # A BudgetTracker: budgeted apps run freely until their time is used up
+        self.budgets = None
+        self.timer = SessionTimer(duration_seconds)
+        self.respawns = respawns
+        self.started_at = time.time()
+        self.last_display = self.timer.display()
+        self.matcher = ProcessMatcher([])
+        self.allowed_processes = []
+        self.block_list = []
+        self.exe_verdicts = {}  # (executable identity, name) -> strict verdict
+
+    def compile(self, mappings):
+        """Build the matcher for this session's apps from mappings"""
+        budgeted = self.budgets.limits.keys() if self.budgets else ()
+        exhausted = self.budgets.exhausted if self.budgets else ()
+        allowed = [app for app in [*self.apps, *budgeted] if app not in exhausted]
+        allowed_rules = [mappings[app] for app in allowed if app in mappings]
+        # Every app that was not picked is blocked, as are spent budgets
+        block_rules = [
+            rules for display, rules in mappings.items()
+            if display not in allowed and (display not in budgeted or display in exhausted)
+        ]
+        # Compiled once so each scan is a set lookup (or one regex) per process
+        matcher = ProcessMatcher(block_rules, allowed_rules)
+        self.allowed_processes = [describe(rules) for rules in allowed_rules]
+        self.block_list = [describe(rules) for rules in block_rules]
+        # A single assignment, so the monitor thread sees old or new rules
+        self.exe_verdicts = {}
+        self.matcher = matcher
+
+    @property
+    def paused(self):
+        return self.timer.is_paused
+
+
+class PolicyEngine:
+    """Concurrent sessions keyed by owner UID, matched in one shared scan.
+
+    Each process is judged by its owner's session, or by the ALL_USERS
+    session when its owner has none. Name verdicts are cached per session,
+    so a scan costs one check per distinct process name plus one owner
+    lookup per PID whose name some session blocks; detail rules (exe,
+    cmdline) add a pass over the PIDs whose owner needs them.
+
+    Strict sessions also classify every other process they govern; each
+    PID is classified once and then costs one dictionary lookup per scan.
+
+    The session table is replaced rather than mutated, so the monitor
+    thread can iterate it without holding the lock.
+    """
+
+    def __init__(self, classifier=None):
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.classifier = classifier or ExecutableClassifier()
+        self.pid_verdicts = {}  # pid -> ((create_time, name), matcher, verdict)
+        self.strict_verdicts = {}
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __iter__(self):
+        return iter(list(self.sessions.values()))
+
+    def get(self, uid):
+        return self.sessions.get(uid)
+
+    def add(self, session):
+        """Install session, returning the one it replaced for that uid, if any"""
+        with self.lock:
+            sessions = dict(self.sessions)
+            previous = sessions.get(session.uid)
+            sessions[session.uid] = session
+            self.sessions = sessions
+        return previous
+
+    def remove(self, uid, session=None):
+        """Remove uid's session, or only session if given; returns what was removed"""
+        with self.lock:
+            current = self.sessions.get(uid)
+            if current is None or (session is not None and current is not session):
+                return None
+            sessions = dict(self.sessions)
+            del sessions[uid]
+            self.sessions = sessions
+        return current
+
+    def session_for(self, uid):
+        """The session that governs uid's processes, paused or not"""
+        sessions = self.sessions
+        return sessions.get(uid, sessions.get(ALL_USERS))
+
+    def session_for_pid(self, snapshot, pid):
+        """The running session that governs pid, or None"""
+        sessions = self.sessions
+        if not sessions:
+            return None
+        if len(sessions) == 1 and ALL_USERS in sessions:
+            session = sessions[ALL_USERS]
+        else:
+            session = sessions.get(snapshot.owner(pid), sessions.get(ALL_USERS))
+        return None if session is None or session.paused else session
+
+    def governs(self, snapshot, pid, session):
+        """True if session, paused or not, is the one that governs pid"""
+        sessions = self.sessions
+        if len(sessions) == 1:
+            return sessions.get(session.uid) is session
+        return sessions.get(snapshot.owner(pid), sessions.get(ALL_USERS)) is session
+
+    def all_paused(self):
+        return all(session.paused for session in self.sessions.values())
+
+    def next_retry(self):
+        """Seconds until a respawn backoff expires or a budget needs a scan, or None"""
+        waits = [session.respawns.next_retry() for session in self.sessions.values()]
+        now = time.time()
+        for deadline in self.budget_deadlines():
+            waits.append(max(0.0, deadline - now))
+        waits = [wait for wait in waits if wait is not None]
+        return min(waits) if waits else None
+
+    def pop_due(self):
+        due = False
+        for session in self.sessions.values():
+            # No short-circuit: every expired backoff must be cleared
+            due = session.respawns.pop_due() or due
+        now = time.time()
+        return due or any(deadline <= now for deadline in self.budget_deadlines())
+
+    def budget_deadlines(self):
+        for session in self.sessions.values():
+            if session.budgets is not None and not session.paused:
+                deadline = session.budgets.next_deadline()
+                if deadline is not None:
+                    yield deadline
+
+    def match_snapshot(self, snapshot):
+        """Return (session, name, pids) for every blocked process in snapshot"""
+        sessions = self.sessions
+        running = [session for session in sessions.values() if not session.paused]
+        if not running:
+            return []
+        global_session = sessions.get(ALL_USERS)
+        if len(sessions) == 1 and global_session is not None:
+            # A single global session needs no owner lookups at all
+            matches = {
+                (id(global_session), name): (global_session, name, pids)
+                for name, pids in global_session.matcher.match_snapshot(snapshot).items()
+            }
+        else:
+            matches = {}
+            for name, pids in snapshot.name_items():
+                blockers = [session for session in running if session.matcher.match_name(name)]
+                if not blockers:
+                    continue
+                for pid in pids:
+                    session = sessions.get(snapshot.owner(pid), global_session)
+                    if session is not None and session in blockers:
+                        matches.setdefault((id(session), name), (session, name, []))[2].append(pid)
+
+            if any(session.matcher.needs_details for session in running):
+                self._match_details(snapshot, sessions, global_session, matches)
+        if any(session.strict for session in running):
+            self._match_strict(snapshot, sessions, global_session, matches)
+        return list(matches.values())
+
+    def blocks_pid(self, snapshot, pid, name, session):
+        """True if session blocks pid, whose lowercased name is name"""
+        matcher = session.matcher
+        exe = cmdline = None
+        if matcher.needs_details:
+            exe, cmdline = snapshot.details(pid)
+        if matcher.match(name, exe, cmdline):
+            return True
+        return session.strict and self.classifier.blocks(snapshot, pid, name, session)
+
+    def _match_details(self, snapshot, sessions, global_session, matches):
+        matched = {pid for _, _, pids in matches.values() for pid in pids}
+        verdicts = {}
+        for pid, (create_time, name) in snapshot.items():
+            if pid in matched:
+                continue
+            session = sessions.get(snapshot.owner(pid), global_session)
+            if session is None or session.paused or not session.matcher.needs_details:
+                continue
+            entry = (create_time, name)
+            cached = self.pid_verdicts.get(pid)
+            if cached is not None and cached[0] == entry and cached[1] is session.matcher:
+                verdict = cached[2]
+            else:
+                exe, cmdline = snapshot.details(pid)
+                verdict = session.matcher.match(name, exe, cmdline)
+            verdicts[pid] = (entry, session.matcher, verdict)
+            if verdict:
+                matches.setdefault((id(session), name), (session, name, []))[2].append(pid)
+        # Rebuilt each pass so dead PIDs do not accumulate
+        self.pid_verdicts = verdicts
+
+    def _match_strict(self, snapshot, sessions, global_session, matches):
+        matched = {pid for _, _, pids in matches.values() for pid in pids}
+        single = global_session if len(sessions) == 1 else None
+        classifier = self.classifier
+        previous = self.strict_verdicts
+        verdicts = {}
+        for pid, entry in snapshot.items():
+            if pid in matched:
+                continue
+            session = single or sessions.get(snapshot.owner(pid), global_session)
+            if session is None or not session.strict or session.paused:
+                continue
+            # The name is part of the key: an exec keeps the PID and create time
+            cached = previous.get(pid)
+            if cached is not None and cached[0] == entry and cached[1] is session.matcher:
+                verdict = cached[2]
+            else:
+                verdict = classifier.blocks(snapshot, pid, entry[1], session)
+            verdicts[pid] = (entry, session.matcher, verdict)
+            if verdict:
+                matches.setdefault((id(session), entry[1]), (session, entry[1], []))[2].append(pid)
+        self.strict_verdicts = verdicts
@@ -0,0 +1,135 @@
+import os
+import select
+import socket
+import struct
+import time
+import logging
+
+# Netlink proc connector constants (linux/connector.h, linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_EXEC = 0x00000002
+
+NLMSG_HDR = struct.Struct('=IHHII')       # len, type, flags, seq, pid
+CN_MSG_HDR = struct.Struct('=IIIIHH')     # idx, val, seq, ack, len, flags
+PROC_EVENT_HDR = struct.Struct('=IIQ')    # what, cpu, timestamp_ns
+EXEC_EVENT = struct.Struct('=II')         # process_pid, process_tgid
+
+
+class NetlinkExecWatcher:
+    """Receive exec notifications from the kernel proc connector.
+
+    Needs CAP_NET_ADMIN (usually root); construction raises OSError otherwise.
+    """
+
+    name = 'netlink'
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self.sock.bind((os.getpid(), CN_IDX_PROC))
+            self._send_op(PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self.sock.close()
+            raise
+        self.overflowed = False
+
+    def _send_op(self, op):
+        payload = struct.pack('=I', op)
+        cn_msg = CN_MSG_HDR.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = NLMSG_HDR.pack(NLMSG_HDR.size + len(cn_msg), NLMSG_DONE, 0, 0, os.getpid())
+        self.sock.send(header + cn_msg)
+
+    def wait_for_pids(self, timeout):
+        """Block up to timeout seconds and return PIDs that called exec"""
+        pids = []
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        while ready:
+            try:
+                data = self.sock.recv(4096, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # ENOBUFS: the kernel dropped events, caller must rescan
+                logging.warning("Proc connector overflow: %s", e)
+                self.overflowed = True
+                break
+            pid = self._parse_exec(data)
+            if pid is not None:
+                pids.append(pid)
+        return pids
+
+    def _parse_exec(self, data):
+        offset = NLMSG_HDR.size + CN_MSG_HDR.size
+        if len(data) < offset + PROC_EVENT_HDR.size + EXEC_EVENT.size:
+            return None
+        what, _, _ = PROC_EVENT_HDR.unpack_from(data, offset)
+        if what != PROC_EVENT_EXEC:
+            return None
+        _, tgid = EXEC_EVENT.unpack_from(data, offset + PROC_EVENT_HDR.size)
+        return tgid
+
+    def close(self):
+        try:
+            self._send_op(PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class ProcDiffWatcher:
+    """Unprivileged fallback that diffs the PID directories in /proc.
+
+    A PID shows up at fork time, usually still carrying the parent's name,
+    so new PIDs are reported again for a few rounds to catch the exec.
+    """
+
+    name = 'procdiff'
+
+    def __init__(self, interval=0.25, recheck_rounds=3):
+        self.interval = interval
+        self.recheck_rounds = recheck_rounds
+        self.known = self._list_pids()
+        self.recent = {}
+        self.overflowed = False
+
+    @staticmethod
+    def _list_pids():
+        return {int(entry) for entry in os.listdir('/proc') if entry.isdigit()}
+
+    def wait_for_pids(self, timeout):
+        """Sleep one diff interval and return new or recently-new PIDs"""
+        time.sleep(min(timeout, self.interval))
+        current = self._list_pids()
+        for pid in current - self.known:
+            self.recent[pid] = self.recheck_rounds
+        self.known = current
+
+        pids = []
+        for pid, rounds in list(self.recent.items()):
+            if pid not in current or rounds <= 0:
+                del self.recent[pid]
+                continue
+            self.recent[pid] = rounds - 1
+            pids.append(pid)
+        return pids
+
+    def close(self):
+        self.known = set()
+        self.recent.clear()
+
+
+def create_exec_watcher():
+    """Return the best available exec watcher, or None if unsupported"""
+    if not os.path.isdir('/proc'):
+        return None
+    if hasattr(socket, 'AF_NETLINK'):
+        try:
+            return NetlinkExecWatcher()
+        except OSError as e:
+            logging.info(f"Proc connector unavailable ({e}), using /proc diff")
+    return ProcDiffWatcher()
@@ -0,0 +1,291 @@
+import os
+import threading
+import time
+import logging
+
+import psutil
+
+# Linux truncates comm to TASK_COMM_LEN - 1 characters
+COMM_MAX_LEN = 15
+
+
+class ProcessSnapshot:
+    """Incremental view of the process table keyed by (pid, create_time).
+
+    Only PIDs that appeared since the last refresh are read; dead PIDs are
+    dropped. PIDs first seen on the previous refresh are read once more so a
+    fork that execs shortly after being indexed gets its real name.
+
+    A refresh can be given a CPU-time deadline; new PIDs left unread when it
+    passes stay unknown and are picked up by the next refresh.
+
+    Callbacks registered with watch() receive each refresh's changes as
+    (started, ended, now): lists of (pid, name, start timestamp) for
+    entries added and dropped, with start times taken from the entries.
+    """
+
+    # How many PIDs to read between deadline checks
+    DEADLINE_STRIDE = 64
+
+    def __init__(self, use_procfs=None):
+        if use_procfs is None:
+            use_procfs = os.path.isdir('/proc') and os.path.exists('/proc/self/stat')
+        self.use_procfs = use_procfs
+        self.entries = {}       # pid -> (create_time, lowercased name)
+        self.by_name = {}       # lowercased name -> set of pids
+        self.extra = {}         # pid -> (exe, cmdline), read on demand
+        self.owners = {}        # pid -> owner uid, read on demand
+        self.young = set()      # pids indexed on the previous refresh
+        self.new_pids = []      # pids that appeared on the last refresh
+        self.pending = False    # last refresh stopped at its deadline
+        self.watchers = []
+        self.started = []       # pids (re)indexed during the current refresh
+        self.ended = []         # (pid, entry) dropped during the current refresh
+        self.boot_time = None
+        self.lock = threading.Lock()
+        # Held across a refresh and its notification so watchers see changes in order
+        self.notify_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def refresh(self, deadline=None):
+        """Bring the snapshot up to date and return the newly seen PIDs
+
+        deadline is a time.thread_time() value after which reading stops.
+        """
+        with self.notify_lock:
+            with self.lock:
+                added = self._refresh(self._list_pids(), deadline)
+                started, ended = self.started, self.ended
+                self.started, self.ended = [], []
+                # Resolved now, before another refresh can drop the entries
+                changes = self.watchers and (started or ended) and self._changes(started, ended)
+            # Outside the lock, so watchers may call owner() and details()
+            if changes:
+                self._notify(*changes)
+        return added
+
+    def _refresh(self, current, deadline=None):
+        known = self.entries.keys()
+        for pid in known - current:
+            self._forget(pid)
+
+        added = []
+        recheck = self.young & current
+        self.pending = False
+        for count, pid in enumerate(current - known, 1):
+            if self._read(pid):
+                added.append(pid)
+            if (deadline is not None and count % self.DEADLINE_STRIDE == 0
+                    and time.thread_time() >= deadline):
+                self.pending = True
+                break
+        for pid in recheck:
+            entry = self.entries.get(pid)
+            if entry is not None and not self._read(pid, entry):
+                self._forget(pid)
+
+        self.young = set(added)
+        self.new_pids = added
+        return added
+
+    def watch(self, callback):
+        """Report changes to callback, starting with every PID already known"""
+        with self.notify_lock:
+            with self.lock:
+                self.watchers.append(callback)
+                started = [(pid, entry[1], self.start_time(entry)) for pid, entry in self.entries.items()]
+            callback(started, [], time.time())
+
+    def unwatch(self, callback):
+        with self.lock:
+            if callback in self.watchers:
+                self.watchers.remove(callback)
+
+    def _changes(self, started, ended):
+        started = [
+            (pid, entry[1], self.start_time(entry))
+            for pid, entry in ((pid, self.entries.get(pid)) for pid in started) if entry
+        ]
+        ended = [(pid, entry[1], self.start_time(entry)) for pid, entry in ended]
+        return started, ended
+
+    def _notify(self, started, ended):
+        now = time.time()
+        for callback in list(self.watchers):
+            try:
+                callback(started, ended, now)
+            except Exception as e:
+                logging.error("Snapshot watcher error: %s", e)
+
+    def start_time(self, entry):
+        """Unix timestamp at which the process behind entry started"""
+        if not self.use_procfs:
+            return entry[0]
+        if self.boot_time is None:
+            self.boot_time = psutil.boot_time()
+            self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        return self.boot_time + entry[0] / self.clock_ticks
+
+    def _list_pids(self):
+        if self.use_procfs:
+            return {int(entry) for entry in os.listdir('/proc') if entry.isdigit()}
+        return set(psutil.pids())
+
+    def _read(self, pid, previous=None):
+        """Read one PID into the cache; return False if it vanished"""
+        info = self._read_procfs(pid) if self.use_procfs else self._read_psutil(pid)
+        if info is None:
+            return False
+        create_time, name = info
+        if previous is not None:
+            if previous == info:
+                return True
+            # Same PID, new image: exe and cmdline changed with it
+            self._forget(pid)
+        self.entries[pid] = info
+        self.by_name.setdefault(name, set()).add(pid)
+        self.started.append(pid)
+        return True
+
+    def _forget(self, pid):
+        self.extra.pop(pid, None)
+        self.owners.pop(pid, None)
+        entry = self.entries.pop(pid, None)
+        if entry is None:
+            return
+        self.ended.append((pid, entry))
+        pids = self.by_name.get(entry[1])
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self.by_name[entry[1]]
+
+    @staticmethod
+    def _read_procfs(pid):
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                stat = f.read()
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            return None
+        # comm is wrapped in parens and may itself contain spaces or parens
+        head, _, tail = stat.rpartition(b')')
+        name = head.partition(b'(')[2].decode(errors='replace')
+        fields = tail.split()
+        try:
+            # starttime is field 22; tail starts at field 3 (state)
+            create_time = int(fields[19])
+        except (IndexError, ValueError):
+            return None
+        if len(name) == COMM_MAX_LEN:
+            name = ProcessSnapshot._full_name(pid, name)
+        return create_time, name.lower()
+
+    @staticmethod
+    def _full_name(pid, comm):
+        """Recover a name longer than comm from argv[0], as psutil does"""
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                argv0 = f.read().split(b'\0', 1)[0].decode(errors='replace')
+        except OSError:
+            return comm
+        exe = os.path.basename(argv0)
+        return exe if exe.startswith(comm) else comm
+
+    @staticmethod
+    def _read_psutil(pid):
+        try:
+            proc = psutil.Process(pid)
+            return proc.create_time(), proc.name().lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        except Exception as e:
+            logging.debug("Snapshot read failed for PID %d: %s", pid, e)
+            return None
+
+    def details(self, pid):
+        """Return (exe, cmdline) for a PID, reading them at most once"""
+        cached = self.extra.get(pid)
+        if cached is None:
+            if self.use_procfs:
+                cached = self._read_details_procfs(pid)
+            else:
+                cached = self._read_details_psutil(pid)
+            with self.lock:
+                if pid in self.entries:
+                    self.extra[pid] = cached
+        return cached
+
+    def owner(self, pid):
+        """Return the UID that owns a PID, reading it at most once"""
+        try:
+            return self.owners[pid]
+        except KeyError:
+            pass
+        uid = self._read_owner_procfs(pid) if self.use_procfs else self._read_owner_psutil(pid)
+        with self.lock:
+            if pid in self.entries:
+                self.owners[pid] = uid
+        return uid
+
+    @staticmethod
+    def _read_owner_procfs(pid):
+        try:
+            return os.stat(f'/proc/{pid}').st_uid
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_owner_psutil(pid):
+        try:
+            return psutil.Process(pid).uids().real
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, AttributeError):
+            # No UIDs on Windows
+            return None
+
+    @staticmethod
+    def _read_details_procfs(pid):
+        try:
+            exe = os.readlink(f'/proc/{pid}/exe')
+        except OSError:
+            exe = None
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+        except OSError:
+            cmdline = None
+        return exe, cmdline
+
+    @staticmethod
+    def _read_details_psutil(pid):
+        try:
+            proc = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None, None
+        try:
+            exe = proc.exe() or None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            exe = None
+        try:
+            cmdline = ' '.join(proc.cmdline()) or None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            cmdline = None
+        return exe, cmdline
+
+    def items(self):
+        """Copy of (pid, (create_time, name)) pairs"""
+        with self.lock:
+            return list(self.entries.items())
+
+    def name_items(self):
+        """Copy of (name, pids) pairs from the name index"""
+        with self.lock:
+            return [(name, list(pids)) for name, pids in self.by_name.items()]
+
+    def pids_for(self, names):
+        """Map each name in names that is running to a list of its PIDs"""
+        with self.lock:
+            if len(names) < len(self.by_name):
+                return {name: list(self.by_name[name]) for name in names if name in self.by_name}
+            return {name: list(pids) for name, pids in self.by_name.items() if name in names}
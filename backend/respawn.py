@@ -0,0 +1,146 @@
+import os
+import signal
+import time
+import logging
+from collections import deque
+
+import psutil
+
+# Parents that must never be killed when escalating a respawn storm
+PROTECTED_PARENTS = frozenset({
+    'systemd', 'init', 'launchd', 'kernel_task', 'kthreadd',
+    'explorer.exe', 'services.exe', 'wininit.exe', 'winlogon.exe', 'svchost.exe', 'csrss.exe',
+    'sh', 'bash', 'zsh', 'fish', 'dash', 'cmd.exe', 'powershell.exe', 'pwsh',
+    'sshd', 'login', 'gdm', 'sddm', 'lightdm', 'gnome-shell', 'plasmashell', 'kwin_x11',
+    'kwin_wayland', 'xfce4-session', 'finder', 'dock', 'loginwindow',
+})
+
+
+class RespawnTracker:
+    """Sliding-window kill rate per process name, with backoff in a storm.
+
+    A storm starts once a name is killed threshold times within window
+    seconds. While it lasts, each further kill doubles the delay before the
+    name may be killed again (base_backoff up to max_backoff). A storm ends
+    after a full window with no kills.
+    """
+
+    def __init__(self, window=10.0, threshold=5, base_backoff=1.0, max_backoff=60.0,
+                 clock=time.monotonic):
+        self.window = window
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.kills = {}          # name -> deque of kill times
+        self.storms = {}         # name -> kills since the storm started
+        self.next_allowed = {}   # name -> earliest time of the next kill
+        self.deferred = set()    # names skipped while backing off
+
+    def allow_kill(self, name):
+        """False while name is backing off after repeated kills"""
+        until = self.next_allowed.get(name)
+        if until is None or self.clock() >= until:
+            return True
+        self.deferred.add(name)
+        return False
+
+    def next_retry(self):
+        """Seconds until a deferred kill may go ahead, or None"""
+        if not self.deferred:
+            return None
+        until = min(self.next_allowed.get(name, 0.0) for name in self.deferred)
+        return max(0.0, until - self.clock())
+
+    def pop_due(self):
+        """True if any deferred kill's backoff has expired, forgetting those names"""
+        if not self.deferred:
+            return False
+        now = self.clock()
+        due = [name for name in self.deferred if self.next_allowed.get(name, 0.0) <= now]
+        self.deferred.difference_update(due)
+        return bool(due)
+
+    def record_kill(self, name, count=1):
+        """Record count kills of name; returns True when a storm starts"""
+        now = self.clock()
+        self.deferred.discard(name)
+        times = self.kills.setdefault(name, deque())
+        while times and now - times[0] > self.window:
+            times.popleft()
+        if not times and name in self.storms:
+            # A quiet window ended the previous storm
+            del self.storms[name]
+            self.next_allowed.pop(name, None)
+        times.extend([now] * count)
+
+        if name in self.storms:
+            self.storms[name] += count
+            backoff = self.base_backoff * 2 ** (self.storms[name] - 1)
+            self.next_allowed[name] = now + min(backoff, self.max_backoff)
+            return False
+        if len(times) >= self.threshold:
+            self.storms[name] = 0
+            return True
+        return False
+
+    def rate(self, name):
+        """Kills of name within the current window"""
+        times = self.kills.get(name)
+        if not times:
+            return 0
+        now = self.clock()
+        return sum(1 for t in times if now - t <= self.window)
+
+    def in_storm(self, name):
+        return name in self.storms
+
+
+def find_launcher(pids, spare=None):
+    """Return the parent process that keeps respawning pids, or None if unsafe
+
+    Protected system, session and shell processes, this process and its
+    ancestors are never returned, nor any process for which spare(proc) is
+    true.
+    """
+    own = {os.getpid()}
+    try:
+        own.update(parent.pid for parent in psutil.Process().parents())
+    except psutil.Error:
+        pass
+    for pid in pids:
+        try:
+            parent = psutil.Process(pid).parent()
+            if parent is None or parent.pid <= 1 or parent.pid in own:
+                continue
+            if parent.name().lower() in PROTECTED_PARENTS or (spare and spare(parent)):
+                continue
+            return parent
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return None
+
+
+def kill_process_group(pids, spare=None):
+    """SIGTERM the process group of pids if it is safe; returns the pgid or None
+
+    Our own group is never signalled, nor a group led by a protected
+    process or one for which spare(proc) is true.
+    """
+    if not hasattr(os, 'killpg'):
+        return None
+    own_groups = {os.getpgrp()}
+    for pid in pids:
+        try:
+            pgid = os.getpgid(pid)
+            # A group led by the blocked process itself adds nothing over its tree
+            if pgid in own_groups or pgid <= 1 or pgid in pids:
+                continue
+            leader = psutil.Process(pgid)
+            if leader.name().lower() in PROTECTED_PARENTS or (spare and spare(leader)):
+                continue
+            os.killpg(pgid, signal.SIGTERM)
+            return pgid
+        except (OSError, psutil.Error) as e:
+            logging.debug("Process group escalation failed for PID %d: %s", pid, e)
+    return None
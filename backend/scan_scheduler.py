@@ -0,0 +1,35 @@
+import time
+
+
+class ScanScheduler:
+    """Pick the delay before the next polling tick.
+
+    Any sign of activity (new PIDs, blocked apps respawning, or a process
+    table too large to finish within one tick's budget) drops the interval
+    to min_interval. Quiet ticks grow it by backoff up to max_interval.
+    """
+
+    def __init__(self, min_interval=0.5, max_interval=5.0, tick_budget=0.05, backoff=2.0):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Scan intervals must satisfy 0 < min_interval <= max_interval")
+        if tick_budget is not None and tick_budget <= 0:
+            raise ValueError("tick_budget must be positive or None")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.tick_budget = tick_budget
+        self.backoff = backoff
+        self.interval = min_interval
+
+    def tick_deadline(self):
+        """Return the thread CPU time at which this tick must yield, or None"""
+        if self.tick_budget is None:
+            return None
+        return time.thread_time() + self.tick_budget
+
+    def next_interval(self, new_pids=0, respawns=0, pending=False):
+        """Record one tick's activity and return the seconds to wait"""
+        if new_pids or respawns or pending:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return self.interval
@@ -0,0 +1,270 @@
+import datetime
+import heapq
+import json
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_SCHEDULE_PATH = Path(__file__).parent / 'schedules.db'
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+DAY_ALIASES = {'daily': range(7), 'weekdays': range(5), 'weekends': range(5, 7)}
+
+# Waits run on the monotonic clock, which stops during suspend, so a long
+# wait is cut into slices of at most this many seconds to notice a resume
+MAX_SLEEP = 300.0
+# Wall-clock drift from the monotonic clock beyond this means a clock jump
+CLOCK_SLACK = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    apps TEXT NOT NULL,
+    uid INTEGER,
+    enabled INTEGER NOT NULL DEFAULT 1
+)
+"""
+
+
+def parse_days(value):
+    """Turn 'weekdays', 'mon,wed,fri', 'mon-fri' or weekday numbers into a frozenset"""
+    if isinstance(value, str):
+        days = set()
+        for part in value.lower().replace(' ', '').split(','):
+            if part in DAY_ALIASES:
+                days.update(DAY_ALIASES[part])
+            elif '-' in part:
+                first, last = (WEEKDAYS.index(day[:3]) for day in part.split('-', 1))
+                days.update(range(first, last + 1) if first <= last else [*range(first, 7), *range(last + 1)])
+            else:
+                days.add(WEEKDAYS.index(part[:3]))
+        return frozenset(days)
+    days = frozenset(int(day) for day in value)
+    if not days <= frozenset(range(7)):
+        raise ValueError(f"Weekdays must be 0 (Monday) to 6: {sorted(days)}")
+    return days
+
+
+def parse_time(value):
+    """Minutes after midnight for 'HH:MM' or a minute count"""
+    if isinstance(value, str):
+        hours, _, minutes = value.partition(':')
+        value = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= value <= 24 * 60:
+        raise ValueError(f"Time of day out of range: {value}")
+    return value
+
+
+def format_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+@dataclass
+class Schedule:
+    """Recurring session window; end <= start runs past midnight"""
+    name: str
+    days: frozenset          # weekdays the window starts on, Monday = 0
+    start: int               # minutes after local midnight
+    end: int
+    apps: list = field(default_factory=list)
+    uid: int = None          # None for the session covering every user
+    enabled: bool = True
+    id: int = None
+
+    @property
+    def duration(self):
+        """Window length in minutes"""
+        return (self.end - self.start) % (24 * 60) or 24 * 60
+
+    def window_starting(self, date):
+        """(start, end) local datetimes of the window on date, or None"""
+        if date.weekday() not in self.days:
+            return None
+        start = datetime.datetime.combine(date, datetime.time()) + datetime.timedelta(minutes=self.start)
+        return start, start + datetime.timedelta(minutes=self.duration)
+
+    def current_window(self, now):
+        """The window containing local datetime now, or None"""
+        # A window that started yesterday may still be running
+        for offset in (0, 1):
+            window = self.window_starting(now.date() - datetime.timedelta(days=offset))
+            if window and window[0] <= now < window[1]:
+                return window
+        return None
+
+    def next_start(self, after):
+        """First window start strictly after local datetime after, or None"""
+        for offset in range(8):
+            window = self.window_starting(after.date() + datetime.timedelta(days=offset))
+            if window and window[0] > after:
+                return window[0]
+        return None
+
+    def to_dict(self):
+        return {
+            'id': self.id, 'name': self.name, 'days': sorted(self.days),
+            'start': format_time(self.start), 'end': format_time(self.end),
+            'apps': list(self.apps), 'uid': self.uid, 'enabled': self.enabled,
+        }
+
+
+class ScheduleStore:
+    """Schedules kept in SQLite next to the app mappings"""
+
+    def __init__(self, path=DEFAULT_SCHEDULE_PATH):
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(SCHEMA)
+
+    def load(self):
+        """Return every schedule, oldest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT id, name, days, start, end, apps, uid, enabled FROM schedules ORDER BY id'
+            ).fetchall()
+        return [
+            Schedule(
+                name=name, days=frozenset(day for day in range(7) if days >> day & 1),
+                start=start, end=end, apps=json.loads(apps), uid=uid, enabled=bool(enabled), id=id,
+            )
+            for id, name, days, start, end, apps, uid, enabled in rows
+        ]
+
+    def add(self, schedule):
+        """Insert schedule, or replace the one with its id; returns the id"""
+        mask = sum(1 << day for day in schedule.days)
+        row = (
+            schedule.id, schedule.name, mask, schedule.start, schedule.end,
+            json.dumps(list(schedule.apps)), schedule.uid, int(schedule.enabled),
+        )
+        with self.lock, self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            cursor = self.conn.execute(
+                'INSERT OR REPLACE INTO schedules (id, name, days, start, end, apps, uid, enabled) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', row,
+            )
+        schedule.id = cursor.lastrowid
+        return schedule.id
+
+    def remove(self, schedule_id):
+        with self.lock, self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            cursor = self.conn.execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
+        return cursor.rowcount > 0
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class ScheduleRunner(threading.Thread):
+    """Start sessions when their schedule's window opens.
+
+    Upcoming window starts sit in a min-heap keyed by wall-clock time and
+    the thread sleeps until the earliest one, so idle cost does not grow
+    with the number of schedules. After every wait the wall clock is
+    compared with the monotonic clock; if they drifted apart (suspend,
+    NTP step, manual change) the heap is rebuilt and any window that is
+    open right now is started for its remaining length.
+    """
+
+    def __init__(self, store, on_due, clock=time.time, monotonic=time.monotonic):
+        super().__init__(daemon=True, name='schedule-runner')
+        self.store = store
+        self.on_due = on_due        # called with (schedule, minutes left)
+        self.clock = clock
+        self.monotonic = monotonic
+        self.heap = []              # (window start timestamp, schedule id)
+        self.schedules = {}
+        self.started = {}           # schedule id -> start timestamp of the last window run
+        self.reload_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.wake = threading.Event()
+
+    def reload(self):
+        """Pick up added, changed or removed schedules"""
+        self.reload_event.set()
+        self.wake.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+
+    def run(self):
+        self.rebuild(self.clock())
+        while not self.stop_event.is_set():
+            wall, mono = self.clock(), self.monotonic()
+            timeout = None
+            if self.heap:
+                timeout = min(max(0.0, self.heap[0][0] - wall), MAX_SLEEP)
+            self.wake.wait(timeout)
+            self.wake.clear()
+            if self.stop_event.is_set():
+                break
+            try:
+                now = self.clock()
+                drift = (now - wall) - (self.monotonic() - mono)
+                if abs(drift) > CLOCK_SLACK:
+                    logging.info("Wall clock moved %+.0fs, rescheduling", drift)
+                    self.rebuild(now)
+                elif self.reload_event.is_set():
+                    self.rebuild(now)
+                else:
+                    self.fire_due(now)
+            except Exception as e:
+                logging.error("Schedule runner error: %s", e)
+
+    def rebuild(self, now):
+        """Reload schedules, run any window open at now and requeue the rest"""
+        self.reload_event.clear()
+        self.schedules = {schedule.id: schedule for schedule in self.store.load() if schedule.enabled}
+        self.started = {id: ts for id, ts in self.started.items() if id in self.schedules}
+        local = datetime.datetime.fromtimestamp(now)
+        self.heap = []
+        for schedule in self.schedules.values():
+            window = schedule.current_window(local)
+            if window and self.started.get(schedule.id) != window[0].timestamp():
+                self.run_window(schedule, window, now)
+            self.push_next(schedule, local)
+        heapq.heapify(self.heap)
+
+    def fire_due(self, now):
+        local = datetime.datetime.fromtimestamp(now)
+        while self.heap and self.heap[0][0] <= now:
+            _, schedule_id = heapq.heappop(self.heap)
+            schedule = self.schedules.get(schedule_id)
+            if schedule is None:
+                continue
+            window = schedule.current_window(local)
+            if window:
+                self.run_window(schedule, window, now)
+            self.push_next(schedule, local, heap=True)
+
+    def push_next(self, schedule, after, heap=False):
+        start = schedule.next_start(after)
+        if start is None:
+            return
+        entry = (start.timestamp(), schedule.id)
+        if heap:
+            heapq.heappush(self.heap, entry)
+        else:
+            self.heap.append(entry)
+
+    def run_window(self, schedule, window, now):
+        start, end = (moment.timestamp() for moment in window)
+        self.started[schedule.id] = start
+        minutes = (end - now) / 60
+        logging.info("Schedule %r due with %.1f minutes left", schedule.name, minutes)
+        try:
+            self.on_due(schedule, minutes)
+        except Exception as e:
+            logging.error("Scheduled session %r failed: %s", schedule.name, e)
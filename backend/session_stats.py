@@ -0,0 +1,217 @@
+import datetime
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_STATS_PATH = Path(__file__).parent / 'session_stats.bin'
+
+# Record kinds
+SESSION = 0   # one per session, app id 0, duration = focused seconds
+FOCUS = 1     # one per allowed app in a session, same duration
+BLOCK = 2     # one per blocked process tree, duration = enforcement latency
+
+# Little-endian fixed-width record: timestamp, duration, app id, kind
+RECORD = struct.Struct('<dfIB3x')
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+class SessionStats:
+    """Append-only session history in fixed-width binary records.
+
+    Records are 20 bytes and appended in time order, so a time range is a
+    contiguous slice found by binary search. App names are interned in a
+    side file, one per line, and records store the line number. Queries
+    read a NumPy view of an mmap when NumPy is installed, struct otherwise.
+    """
+
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        self.path = str(path)
+        self.names_path = self.path + '.apps'
+        self.lock = threading.Lock()
+        self.names = None
+        self.ids = None
+
+    def _read_names(self):
+        try:
+            with open(self.names_path, 'r', encoding='utf-8') as f:
+                return f.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def _load_names(self):
+        if self.names is None:
+            self.names = self._read_names()
+            if not self.names:
+                self.names = ['']
+                with open(self.names_path, 'w', encoding='utf-8') as f:
+                    f.write('\n')
+            self.ids = {name: i for i, name in enumerate(self.names)}
+        return self.names
+
+    def _app_id(self, name):
+        self._load_names()
+        app_id = self.ids.get(name)
+        if app_id is None:
+            # The name is on disk before any record refers to it
+            with open(self.names_path, 'a', encoding='utf-8') as f:
+                f.write(name.replace('\n', ' ') + '\n')
+            app_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return app_id
+
+    def _append(self, records):
+        data = b''.join(
+            RECORD.pack(ts, duration, self._app_id(app), kind)
+            for ts, duration, app, kind in records
+        )
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def record_session(self, started, duration, apps):
+        """Record a finished session that started at wall time started"""
+        with self.lock:
+            self._append(
+                [(started, duration, '', SESSION)]
+                + [(started, duration, app, FOCUS) for app in apps]
+            )
+
+    def record_block(self, name, latency=0.0, ts=None):
+        with self.lock:
+            self._append([(ts if ts is not None else time.time(), latency, name, BLOCK)])
+
+    def _open(self):
+        """Return an mmap of all whole records, or None if there are none"""
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                # Ignore a record torn by a crash mid-append
+                size -= size % RECORD.size
+                if size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _bisect(buf, count, ts):
+        """Index of the first record at or after ts"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from('<d', buf, mid * RECORD.size)[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _slice(self, buf, start, end):
+        count = len(buf) // RECORD.size
+        first = 0 if start is None else self._bisect(buf, count, start)
+        last = count if end is None else self._bisect(buf, count, end)
+        return first, max(first, last)
+
+    def query(self, start=None, end=None):
+        """Return (per_day, per_app) totals for records with start <= ts < end
+
+        per_day maps datetime.date to {'focus', 'sessions', 'blocks'} and
+        per_app maps app name to {'focus', 'blocks'}; focus is in seconds.
+        """
+        # Read the names afresh: another process may be the one writing
+        names = self._read_names()
+        buf = self._open()
+        if buf is None:
+            return {}, {}
+        try:
+            first, last = self._slice(buf, start, end)
+            np = _numpy()
+            if np is not None:
+                return self._query_numpy(np, buf, first, last, names)
+            return self._query_struct(buf, first, last, names)
+        finally:
+            buf.close()
+
+    def per_day(self, start=None, end=None):
+        return self.query(start, end)[0]
+
+    def per_app(self, start=None, end=None):
+        return self.query(start, end)[1]
+
+    def _query_numpy(self, np, buf, first, last, names):
+        dtype = np.dtype([('ts', '<f8'), ('duration', '<f4'), ('app', '<u4'), ('kind', 'u1'), ('pad', 'V3')])
+        rows = np.frombuffer(buf, dtype=dtype, count=last - first, offset=first * RECORD.size)
+        ts, duration, app, kind = rows['ts'], rows['duration'].astype(np.float64), rows['app'], rows['kind']
+        sessions, focus, blocks = kind == SESSION, kind == FOCUS, kind == BLOCK
+
+        # Local days: one UTC offset lookup per distinct UTC day, not per record
+        utc_days = (ts // 86400).astype(np.int64)
+        unique_days, inverse = np.unique(utc_days, return_inverse=True)
+        offsets = np.array([_utc_offset(day * 86400 + 43200) for day in unique_days], dtype=np.float64)
+        days = ((ts + offsets[inverse]) // 86400).astype(np.int64)
+        day_keys, day_index = np.unique(days, return_inverse=True)
+        n = len(day_keys)
+        day_focus = np.bincount(day_index, weights=duration * sessions, minlength=n)
+        day_sessions = np.bincount(day_index[sessions], minlength=n)
+        day_blocks = np.bincount(day_index[blocks], minlength=n)
+        per_day = {
+            datetime.date.fromordinal(EPOCH_ORDINAL + int(day)): {
+                'focus': float(day_focus[i]), 'sessions': int(day_sessions[i]), 'blocks': int(day_blocks[i]),
+            }
+            for i, day in enumerate(day_keys)
+        }
+
+        m = max(len(names), int(app.max()) + 1 if len(app) else 0)
+        app_focus = np.bincount(app, weights=duration * focus, minlength=m)
+        app_blocks = np.bincount(app[blocks], minlength=m)
+        seen = np.bincount(app[focus | blocks], minlength=m)
+        per_app = {
+            _name(names, i): {'focus': float(app_focus[i]), 'blocks': int(app_blocks[i])}
+            for i in np.flatnonzero(seen)
+        }
+        return per_day, per_app
+
+    def _query_struct(self, buf, first, last, names):
+        per_day, per_app = {}, {}
+        day_cache = {}
+        view = memoryview(buf)[first * RECORD.size:last * RECORD.size]
+        try:
+            for ts, duration, app, kind in RECORD.iter_unpack(view):
+                # UTC offsets are whole quarter hours, so cache local dates per quarter
+                quarter = int(ts // 900)
+                day = day_cache.get(quarter)
+                if day is None:
+                    day = day_cache[quarter] = datetime.date.fromtimestamp(ts)
+                if kind == SESSION:
+                    totals = per_day.setdefault(day, {'focus': 0.0, 'sessions': 0, 'blocks': 0})
+                    totals['focus'] += duration
+                    totals['sessions'] += 1
+                elif kind == FOCUS:
+                    per_app.setdefault(_name(names, app), {'focus': 0.0, 'blocks': 0})['focus'] += duration
+                elif kind == BLOCK:
+                    per_day.setdefault(day, {'focus': 0.0, 'sessions': 0, 'blocks': 0})['blocks'] += 1
+                    per_app.setdefault(_name(names, app), {'focus': 0.0, 'blocks': 0})['blocks'] += 1
+        finally:
+            view.release()
+        return per_day, per_app
+
+
+def _utc_offset(ts):
+    return time.localtime(ts).tm_gmtoff
+
+
+def _name(names, app_id):
+    return names[app_id] if app_id < len(names) else f'app #{app_id}'
@@ -0,0 +1,84 @@
+import math
+import threading
+import time
+
+
+class SessionTimer:
+    """Deadline-based countdown driven by time.monotonic().
+
+    Nothing sleeps here: the owner asks how long until the display should
+    change next, waits that long in its own loop and then polls. Remaining
+    time is always computed from the deadline, so late wakeups never add up.
+    """
+
+    def __init__(self, duration_seconds, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.deadline = clock() + duration_seconds
+        self.total = duration_seconds
+        self.paused_remaining = None
+        self.expired = False
+
+    @property
+    def is_paused(self):
+        return self.paused_remaining is not None
+
+    def remaining(self):
+        """Seconds left in the session, never negative"""
+        with self.lock:
+            return self._remaining()
+
+    def _remaining(self):
+        if self.paused_remaining is not None:
+            return self.paused_remaining
+        return max(0.0, self.deadline - self.clock())
+
+    def elapsed(self):
+        """Seconds counted down so far, pauses excluded"""
+        with self.lock:
+            return max(0.0, self.total - self._remaining())
+
+    def display(self):
+        """Return the remaining time as (minutes, seconds), rounded up"""
+        return divmod(math.ceil(self.remaining()), 60)
+
+    def pause(self):
+        with self.lock:
+            if self.paused_remaining is None and not self.expired:
+                self.paused_remaining = self._remaining()
+
+    def resume(self):
+        with self.lock:
+            if self.paused_remaining is not None:
+                self.deadline = self.clock() + self.paused_remaining
+                self.paused_remaining = None
+
+    def extend(self, seconds):
+        with self.lock:
+            if self.expired:
+                return
+            self.total += seconds
+            if self.paused_remaining is not None:
+                self.paused_remaining = max(0.0, self.paused_remaining + seconds)
+            else:
+                self.deadline += seconds
+
+    def seconds_until_next_tick(self):
+        """Seconds until the displayed value changes, or None while paused"""
+        with self.lock:
+            if self.paused_remaining is not None or self.expired:
+                return None
+            remaining = self._remaining()
+            if remaining <= 0:
+                return 0.0
+            return remaining - (math.ceil(remaining) - 1)
+
+    def consume_expiry(self):
+        """Return True exactly once, on the first poll after the deadline"""
+        with self.lock:
+            if self.expired or self.paused_remaining is not None:
+                return False
+            if self._remaining() > 0:
+                return False
+            self.expired = True
+            return True
@@ -0,0 +1,58 @@
+"""Lightweight startup timing used by ``main.py --profile-startup``.
+
+Kept dependency-free so it can be imported before anything expensive.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Record named startup phases as wall-clock and CPU durations"""
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.phases = []  # (name, start offset, wall seconds, cpu seconds)
+
+    def enable(self, origin=None):
+        self.enabled = True
+        if origin is not None:
+            self.origin = origin
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append((
+                name,
+                start - self.origin,
+                time.perf_counter() - start,
+                time.process_time() - cpu_start,
+            ))
+
+    def mark(self, name):
+        """Record an instant, e.g. the first event loop turn after show()"""
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self.origin, 0.0, 0.0))
+
+    def total(self):
+        return time.perf_counter() - self.origin
+
+    def report(self):
+        lines = [f"{'phase':<32}{'at ms':>10}{'wall ms':>10}{'cpu ms':>10}"]
+        for name, offset, wall, cpu in self.phases:
+            lines.append(f"{name:<32}{offset * 1000:>10.1f}{wall * 1000:>10.1f}{cpu * 1000:>10.1f}")
+        modules = sum(1 for name in sys.modules if not name.startswith('_'))
+        lines.append(f"{'total':<32}{self.total() * 1000:>10.1f}")
+        lines.append(f"{modules} modules loaded")
+        return '\n'.join(lines)
+
+
+# Shared instance; phases are no-ops until main() enables it
+profiler = StartupProfiler()
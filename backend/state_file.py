@@ -0,0 +1,85 @@
+"""Small JSON state files rewritten atomically off the caller's thread."""
+import atexit
+import json
+import os
+import threading
+import time
+import logging
+from pathlib import Path
+
+_NOTHING = object()
+
+
+class JsonStateWriter:
+    """Keep path holding the latest state passed to write().
+
+    write() only swaps in the new state and wakes a writer thread, so the
+    caller never waits for the disk; states arriving faster than they can
+    be written are coalesced. Each state goes to a temporary file that then
+    replaces path, so readers see the old or the new state, never a mix.
+    Writing None removes the file. Pending states are flushed at exit.
+
+    States are serialized on the writer thread and must not be mutated
+    after they are passed in.
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.pending = _NOTHING
+        self.busy = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def write(self, state):
+        with self.condition:
+            self.pending = state
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, daemon=True, name=f'state-{self.path.stem}'
+                )
+                self.thread.start()
+                atexit.register(self.flush)
+            self.condition.notify_all()
+
+    def flush(self, timeout=5.0):
+        """Wait until the latest state is on disk; False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.pending is not _NOTHING or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is _NOTHING:
+                    self.condition.wait()
+                state, self.pending = self.pending, _NOTHING
+                self.busy = True
+            try:
+                self.write_now(state)
+            except (OSError, TypeError, ValueError) as e:
+                logging.error("Could not write %s: %s", self.path, e)
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def write_now(self, state):
+        if state is None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            return
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
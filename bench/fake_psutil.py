@@ -0,0 +1,230 @@
+"""A synthetic process table behind a psutil-compatible surface.
+
+install() swaps it in for psutil in the backend modules, so the real
+snapshot, matcher, enforcer and respawn code runs against it without
+touching real processes.
+"""
+import contextlib
+import random
+import time
+
+import psutil
+
+NoSuchProcess = psutil.NoSuchProcess
+AccessDenied = psutil.AccessDenied
+ZombieProcess = psutil.ZombieProcess
+Error = psutil.Error
+STATUS_RUNNING = psutil.STATUS_RUNNING
+STATUS_ZOMBIE = psutil.STATUS_ZOMBIE
+
+# Modules that import psutil at module level
+PATCHED_MODULES = (
+    'backend.core', 'backend.enforcement', 'backend.process_snapshot', 'backend.respawn',
+)
+
+# Reserved PIDs: init and the process running the benchmark
+INIT_PID = 1
+SELF_PID = 2
+
+
+class FakeProc:
+    __slots__ = ('pid', 'name', 'ppid', 'create_time', 'exe', 'cmdline', 'children', 'respawn')
+
+    def __init__(self, pid, name, ppid, create_time, exe, cmdline, respawn):
+        self.pid = pid
+        self.name = name
+        self.ppid = ppid
+        self.create_time = create_time
+        self.exe = exe
+        self.cmdline = cmdline
+        self.children = set()
+        self.respawn = respawn
+
+
+class ProcessTable:
+    """Processes, their parent links and how they respawn when killed.
+
+    A process spawned with respawn=True is restarted by its parent, under
+    a new PID, as soon as it dies, for as long as the parent is alive.
+    """
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.procs = {}
+        self.next_pid = 100
+        self.spawned_at = {}   # pid -> perf_counter() at spawn
+        self.kill_latency = []  # spawn to death, seconds, for killed processes
+        self.kills = 0
+        self.respawns = 0
+        for pid, name in ((INIT_PID, 'systemd'), (SELF_PID, 'python')):
+            self.procs[pid] = FakeProc(pid, name, 0, 0.0, f'/usr/bin/{name}', name, False)
+
+    def spawn(self, name, ppid=INIT_PID, respawn=False, cmdline=None):
+        pid = self.next_pid
+        self.next_pid += 1
+        self.procs[pid] = FakeProc(
+            pid, name, ppid, time.time(), f'/usr/bin/{name}', cmdline or f'{name} --flag', respawn
+        )
+        parent = self.procs.get(ppid)
+        if parent is not None:
+            parent.children.add(pid)
+        self.spawned_at[pid] = time.perf_counter()
+        return pid
+
+    def exit(self, pid, killed=False):
+        proc = self.procs.pop(pid, None)
+        if proc is None:
+            return
+        started = self.spawned_at.pop(pid, None)
+        if killed:
+            self.kills += 1
+            if started is not None:
+                self.kill_latency.append(time.perf_counter() - started)
+        parent = self.procs.get(proc.ppid)
+        if parent is not None:
+            parent.children.discard(pid)
+        for child in proc.children:
+            orphan = self.procs.get(child)
+            if orphan is not None:
+                orphan.ppid = INIT_PID
+        if killed and proc.respawn and parent is not None and proc.ppid > SELF_PID:
+            self.respawns += 1
+            self.spawn(proc.name, proc.ppid, respawn=True, cmdline=proc.cmdline)
+
+    def churn(self, count, names):
+        """Replace count random unprotected, non-respawning processes"""
+        candidates = [pid for pid, proc in self.procs.items() if pid > SELF_PID and not proc.respawn
+                      and not proc.children]
+        for pid in self.rng.sample(candidates, min(count, len(candidates))):
+            self.exit(pid)
+        for _ in range(count):
+            self.spawn(self.rng.choice(names))
+
+    def __len__(self):
+        return len(self.procs)
+
+
+class FakeProcess:
+    """psutil.Process look-alike over a ProcessTable"""
+
+    def __init__(self, table, pid=None):
+        self.table = table
+        self.pid = SELF_PID if pid is None else pid
+        proc = table.procs.get(self.pid)
+        if proc is None:
+            raise NoSuchProcess(self.pid)
+        self._create_time = proc.create_time
+
+    def _proc(self):
+        proc = self.table.procs.get(self.pid)
+        if proc is None or proc.create_time != self._create_time:
+            raise NoSuchProcess(self.pid)
+        return proc
+
+    def name(self):
+        return self._proc().name
+
+    def create_time(self):
+        return self._proc().create_time
+
+    def exe(self):
+        return self._proc().exe
+
+    def cmdline(self):
+        return self._proc().cmdline.split()
+
+    def status(self):
+        self._proc()
+        return STATUS_RUNNING
+
+    def is_running(self):
+        proc = self.table.procs.get(self.pid)
+        return proc is not None and proc.create_time == self._create_time
+
+    def parent(self):
+        ppid = self._proc().ppid
+        return FakeProcess(self.table, ppid) if ppid in self.table.procs else None
+
+    def parents(self):
+        parents = []
+        parent = self.parent()
+        while parent is not None:
+            parents.append(parent)
+            parent = parent.parent()
+        return parents
+
+    def children(self, recursive=False):
+        found = []
+        stack = list(self._proc().children)
+        while stack:
+            pid = stack.pop()
+            proc = self.table.procs.get(pid)
+            if proc is None:
+                continue
+            found.append(FakeProcess(self.table, pid))
+            if recursive:
+                stack.extend(proc.children)
+        return found
+
+    def terminate(self):
+        if self.pid <= SELF_PID:
+            raise AccessDenied(self.pid)
+        self._proc()
+        self.table.exit(self.pid, killed=True)
+
+    kill = terminate
+
+
+class FakePsutil:
+    """The subset of the psutil module the backend uses"""
+
+    NoSuchProcess = NoSuchProcess
+    AccessDenied = AccessDenied
+    ZombieProcess = ZombieProcess
+    Error = Error
+    STATUS_RUNNING = STATUS_RUNNING
+    STATUS_ZOMBIE = STATUS_ZOMBIE
+
+    def __init__(self, table):
+        self.table = table
+
+    def Process(self, pid=None):
+        return FakeProcess(self.table, pid)
+
+    def pids(self):
+        return list(self.table.procs)
+
+    def process_iter(self, attrs=None):
+        for pid in list(self.table.procs):
+            try:
+                yield FakeProcess(self.table, pid)
+            except NoSuchProcess:
+                continue
+
+    @staticmethod
+    def wait_procs(procs, timeout=None):
+        gone = [proc for proc in procs if not proc.is_running()]
+        alive = [proc for proc in procs if proc.is_running()]
+        return gone, alive
+
+
+@contextlib.contextmanager
+def install(table):
+    """Make the backend see table instead of the real process list"""
+    import importlib
+
+    fake = FakePsutil(table)
+    modules = [importlib.import_module(name) for name in PATCHED_MODULES]
+    saved = [module.psutil for module in modules]
+    for module in modules:
+        module.psutil = fake
+    # Fake PIDs may collide with real ones: never signal real process groups
+    core = importlib.import_module('backend.core')
+    kill_process_group = core.kill_process_group
+    core.kill_process_group = lambda pids, spare=None: None
+    try:
+        yield fake
+    finally:
+        core.kill_process_group = kill_process_group
+        for module, original in zip(modules, saved):
+            module.psutil = original
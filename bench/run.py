@@ -0,0 +1,279 @@
+"""Benchmark the monitor and enforcement paths on a synthetic process table.
+
+    python -m bench.run                  # full matrix, print results
+    python -m bench.run --quick          # small matrix for CI
+    python -m bench.run --compare        # exit 1 on regressions vs bench/baseline.json
+    python -m bench.run --save-baseline  # record the current results as the baseline
+
+Timings depend on the machine: save a baseline on the hardware that will
+compare against it. Respawn tracking runs on a simulated clock so the
+results do not depend on how fast ticks happen to run.
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench.fake_psutil import ProcessTable, install
+from backend.core import FocusGuardCore
+from backend.mapping_store import MappingStore
+from backend.policy import ALL_USERS, UserSession
+from backend.session_stats import SessionStats
+from backend.respawn import RespawnTracker
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+PROCESS_COUNTS = (100, 1000, 5000, 20000)
+BLOCK_LIST_SIZES = (10, 200)
+# none: fresh blocked launches each tick
+# respawn: blocked apps relaunched by a protected parent, so kills back off
+# storm: blocked apps relaunched by an unprotected launcher, which gets stopped
+PATTERNS = ('none', 'respawn', 'storm')
+QUICK = {'processes': (100, 5000), 'blocked': (10,), 'patterns': PATTERNS}
+
+BACKGROUND_NAMES = [f'service{i}' for i in range(300)]
+LAUNCHES_PER_TICK = 5
+# Simulated seconds between ticks, as seen by respawn tracking
+TICK_SECONDS = {'none': 5.0, 'respawn': 0.5, 'storm': 0.5}
+
+# Metric -> smallest absolute increase that counts as a regression
+COMPARED = {
+    'start_session_ms': 2.0,
+    'cold_tick_ms': 2.0,
+    'tick_p95_ms': 0.5,
+    'detect_to_kill_p95_ms': 1.0,
+    'terminate_process_ms': 0.5,
+    'cpu_s': 0.05,
+    'peak_kib': 256,
+}
+
+
+class SimClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Scenario:
+    """One process count, block-list size and respawn pattern"""
+
+    def __init__(self, processes, blocked, pattern, ticks):
+        self.processes = processes
+        self.blocked = blocked
+        self.pattern = pattern
+        self.ticks = ticks
+
+    @property
+    def key(self):
+        return f'{self.processes}p-{self.blocked}b-{self.pattern}'
+
+    def build(self, workdir):
+        """Return a fresh (table, core, blocked names) for this scenario"""
+        table = ProcessTable(seed=self.processes * 31 + self.blocked)
+        blocked_names = [f'blocked{i}.exe' for i in range(self.blocked)]
+        while len(table) < self.processes:
+            table.spawn(table.rng.choice(BACKGROUND_NAMES))
+
+        if self.pattern != 'none':
+            parent_name = 'explorer.exe' if self.pattern == 'respawn' else 'steam'
+            parent = table.spawn(parent_name)
+            for name in blocked_names[:LAUNCHES_PER_TICK]:
+                table.spawn(name, parent, respawn=True)
+
+        mappings = {f'Blocked {i}': name for i, name in enumerate(blocked_names)}
+        mappings['Editor'] = 'editor'
+        store = MappingStore(':memory:', seed_path=None)
+        store.bulk_import(mappings)
+        core = FocusGuardCore(
+            monitor_mode='poll', use_procfs=False, mapping_store=store,
+            watch_mappings=False, stats=SessionStats(Path(workdir) / f'{self.key}.bin'),
+        )
+        return table, core, blocked_names
+
+    def launch(self, table, blocked_names):
+        """Start this tick's blocked processes"""
+        if self.pattern == 'none':
+            for _ in range(LAUNCHES_PER_TICK):
+                table.spawn(table.rng.choice(blocked_names))
+
+    def run(self, workdir, trace_memory=False):
+        with tempfile.TemporaryDirectory(dir=workdir) as scenario_dir:
+            table, core, blocked_names = self.build(scenario_dir)
+            with install(table):
+                return self._run(table, core, blocked_names, trace_memory)
+
+    def _run(self, table, core, blocked_names, trace_memory):
+        results = {}
+        detect_to_kill = []
+        on_result = core.enforcer.on_result
+
+        def record(result):
+            detect_to_kill.append(result.latency)
+            on_result(result)
+        core.enforcer.on_result = record
+
+        # Session start cost, then drive the scans ourselves for stable timings
+        start = time.perf_counter()
+        core.start_session(['Editor'], 25)
+        results['start_session_ms'] = (time.perf_counter() - start) * 1000
+        core.stop_session()
+        wait_idle(core)
+        core.snapshot = type(core.snapshot)(use_procfs=False)
+        clock = SimClock()
+        session = UserSession(ALL_USERS, ['Editor'], 25 * 60, RespawnTracker(clock=clock))
+        session.compile(core.app_mappings)
+        core.policies.add(session)
+        detect_to_kill.clear()
+        table.kill_latency.clear()
+
+        if trace_memory:
+            tracemalloc.start()
+        cpu = time.process_time()
+        ticks = []
+        for _ in range(self.ticks):
+            table.churn(max(1, self.processes // 100), BACKGROUND_NAMES)
+            self.launch(table, blocked_names)
+            start = time.perf_counter()
+            core.scan_processes(core.scheduler.tick_deadline())
+            ticks.append(time.perf_counter() - start)
+            wait_idle(core)
+            clock.now += TICK_SECONDS[self.pattern]
+        cpu = time.process_time() - cpu
+        if trace_memory:
+            results['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+            return results
+
+        # One manual termination of a running blocked app
+        self.launch(table, blocked_names)
+        name = blocked_names[0]
+        table.spawn(name)
+        start = time.perf_counter()
+        core.terminate_process(name)
+        results['terminate_process_ms'] = (time.perf_counter() - start) * 1000
+        wait_idle(core)
+        core.policies.remove(ALL_USERS)
+        core.enforcer.shutdown(wait=True)
+
+        results.update({
+            'cold_tick_ms': ticks[0] * 1000,
+            'tick_p50_ms': statistics.median(ticks[1:]) * 1000,
+            'tick_p95_ms': percentile(ticks[1:], 0.95) * 1000,
+            'tick_max_ms': max(ticks[1:]) * 1000,
+            'detect_to_kill_p50_ms': percentile(detect_to_kill, 0.5) * 1000,
+            'detect_to_kill_p95_ms': percentile(detect_to_kill, 0.95) * 1000,
+            'spawn_to_kill_p95_ms': percentile(table.kill_latency, 0.95) * 1000,
+            'kills': table.kills,
+            'respawns': table.respawns,
+            'cpu_s': cpu,
+        })
+        return results
+
+
+def wait_idle(core, timeout=5.0):
+    """Wait until the enforcer has finished every queued tree"""
+    deadline = time.monotonic() + timeout
+    while core.enforcer.in_flight and time.monotonic() < deadline:
+        time.sleep(0.0005)
+
+
+def run_matrix(processes, blocked, patterns, ticks, repeat):
+    """Run every scenario repeat times and keep the median of each metric"""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in processes:
+            for size in blocked:
+                for pattern in patterns:
+                    scenario = Scenario(count, size, pattern, ticks)
+                    runs = [scenario.run(workdir) for _ in range(repeat)]
+                    metrics = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+                    metrics.update(Scenario(count, size, pattern, min(ticks, 10)).run(workdir, trace_memory=True))
+                    results[scenario.key] = metrics
+                    print(format_row(scenario.key, metrics), flush=True)
+    return results
+
+
+def format_row(key, m):
+    return (
+        f"{key:<22} start {m['start_session_ms']:7.2f}ms  cold {m['cold_tick_ms']:7.2f}ms  "
+        f"tick p50/p95 {m['tick_p50_ms']:6.2f}/{m['tick_p95_ms']:6.2f}ms  "
+        f"kill p95 {m['detect_to_kill_p95_ms']:6.2f}ms  cpu {m['cpu_s']:5.2f}s  "
+        f"peak {m['peak_kib']:8.0f}KiB  kills {m['kills']}"
+    )
+
+
+def compare(results, baseline, tolerance):
+    """Return a line per metric that regressed beyond tolerance"""
+    regressions = []
+    for key, metrics in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, floor in COMPARED.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append(f"{key} {metric}: {old:.2f} -> {new:.2f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FocusGuard monitor/enforcement benchmarks")
+    parser.add_argument('--quick', action='store_true', help="Run the small CI matrix")
+    parser.add_argument('--ticks', type=int, default=50, help="Scan ticks per scenario")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per scenario; metrics are medians")
+    parser.add_argument('--compare', action='store_true', help="Fail on regressions vs the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Allowed relative slowdown before a metric regresses (default 0.5)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--output', type=Path, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    # The backend's per-block logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+    if args.quick:
+        matrix = QUICK
+    else:
+        matrix = {'processes': PROCESS_COUNTS, 'blocked': BLOCK_LIST_SIZES, 'patterns': PATTERNS}
+    results = run_matrix(matrix['processes'], matrix['blocked'], matrix['patterns'], args.ticks, args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True))
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print(f"Saved baseline to {args.baseline}")
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}")
+            return 1
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,85 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
+import time
+import argparse
+import logging
+
+STARTUP = time.perf_counter()
+
+from backend.startup_profile import profiler
+from backend.log_pipeline import setup_logging
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="FocusGuard - Distraction Blocker")
+    parser.add_argument(
+        '--daemon', nargs='?', const='', metavar='SOCKET',
+        help="Control a running FocusGuard daemon instead of enforcing in-process"
+    )
+    parser.add_argument(
+        '--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        help="Minimum level written to focusguard.log"
+    )
+    parser.add_argument(
+        '--metrics', nargs='?', const=0, type=int, metavar='PORT',
+        help="Collect enforcement metrics, and serve them on localhost:PORT/metrics if given"
+    )
+    parser.add_argument(
+        '--freeze', action='store_true',
+        help="Freeze blocked apps until the session ends instead of closing them"
+    )
+    parser.add_argument(
+        '--profile-startup', action='store_true',
+        help="Print import and init timings once the app is ready, then exit"
+    )
+    parser.add_argument(
+        '--startup-budget', type=float, metavar='MS',
+        help="With --profile-startup, exit with status 1 if startup takes longer"
+    )
+    return parser.parse_known_args(argv)[0]
+
+def report_startup(app, budget_ms):
+    print(profiler.report(), file=sys.stderr)
+    total_ms = profiler.total() * 1000
+    if budget_ms is not None and total_ms > budget_ms:
+        print(f"Startup took {total_ms:.1f} ms, over the {budget_ms:.1f} ms budget", file=sys.stderr)
+        app.exit(1)
+    else:
+        app.exit(0)
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    args = parse_args(sys.argv[1:])
+    if args.profile_startup:
+        profiler.enable(STARTUP)
+    with profiler.phase("logging"):
+        setup_logging('focusguard.log', level=getattr(logging, args.log_level))
+    with profiler.phase("import PyQt5"):
+        from PyQt5.QtWidgets import QApplication
+    with profiler.phase("QApplication"):
+        app = QApplication(sys.argv)
+    with profiler.phase("import ui"):
+        from ui.main_window import MainWindow
+
+    backend_options = {}
+    if args.freeze and args.daemon is None:
+        backend_options['enforcement'] = 'freeze'
+    if args.metrics is not None and args.daemon is None:
+        from backend.metrics import Metrics, serve
+        backend_options['metrics'] = Metrics()
+        if args.metrics:
+            serve(backend_options['metrics'], args.metrics)
+
+    focus_guard = None
+    if args.daemon is not None:
+        from backend.app_logic import DaemonFocusGuard
+        from backend.client import DaemonClient
+        focus_guard = DaemonFocusGuard(DaemonClient(args.daemon or None))
+
+    with profiler.phase("MainWindow()"):
+        window = MainWindow(focus_guard, backend_options)
+    if args.profile_startup:
+        window.backend_ready.connect(lambda: report_startup(app, args.startup_budget))
+    with profiler.phase("show"):
+        window.show()
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
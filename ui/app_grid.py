@@ -0,0 +1,163 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QSize, QRect, QSortFilterProxyModel, pyqtSignal
+)
+from PyQt5.QtGui import QColor, QFont, QPen
+
+CARD_SIZE = QSize(120, 120)
+
+
+class AppListModel(QAbstractListModel):
+    """App display names plus which of them are selected.
+
+    Selection lives in the model (Qt.CheckStateRole) rather than in the
+    view, so it survives search filtering and mapping reloads.
+    """
+    selectionChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.apps = []
+        self.rows = {}
+        self.selected = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.apps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        app = self.apps[index.row()]
+        if role == Qt.DisplayRole:
+            return app
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if app in self.selected else Qt.Unchecked
+        return None
+
+    def set_apps(self, apps):
+        """Update to apps, inserting and removing only the rows that changed"""
+        wanted = set(apps)
+        removed = [row for row, app in enumerate(self.apps) if app not in wanted]
+        added = [app for app in apps if app not in self.rows]
+        # Large changes are cheaper as one reset than row-by-row signals
+        if len(removed) + len(added) > max(64, len(self.apps) // 2):
+            self.beginResetModel()
+            self.apps = list(dict.fromkeys(apps))
+            self._reindex()
+            self.selected &= wanted
+            self.endResetModel()
+        else:
+            for row in reversed(removed):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.selected.discard(self.apps.pop(row))
+                self.endRemoveRows()
+            if removed:
+                self._reindex()
+            self.insert_apps(added)
+        self.selectionChanged.emit()
+
+    def insert_apps(self, apps):
+        apps = [app for app in dict.fromkeys(apps) if app not in self.rows]
+        if not apps:
+            return
+        first = len(self.apps)
+        self.beginInsertRows(QModelIndex(), first, first + len(apps) - 1)
+        for offset, app in enumerate(apps):
+            self.rows[app] = first + offset
+        self.apps.extend(apps)
+        self.endInsertRows()
+
+    def _reindex(self):
+        self.rows = {app: row for row, app in enumerate(self.apps)}
+
+    def toggle(self, row):
+        """Flip one app's selection and repaint only its cell"""
+        app = self.apps[row]
+        if app in self.selected:
+            self.selected.remove(app)
+        else:
+            self.selected.add(app)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.selectionChanged.emit()
+
+    def set_selected(self, apps):
+        self.selected = set(apps) & set(self.rows)
+        if self.apps:
+            self.dataChanged.emit(self.index(0), self.index(len(self.apps) - 1), [Qt.CheckStateRole])
+        self.selectionChanged.emit()
+
+    def selected_apps(self):
+        return [app for app in self.apps if app in self.selected]
+
+
+class AppCardDelegate(QStyledItemDelegate):
+    """Paints an app card straight onto the view; no per-app widgets"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.icon_font = QFont()
+        self.icon_font.setPixelSize(24)
+        self.name_font = QFont()
+        self.name_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return CARD_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(painter.Antialiasing)
+        rect = option.rect.adjusted(5, 5, -5, -5)
+        selected = index.data(Qt.CheckStateRole) == Qt.Checked
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        # Icon area
+        icon_rect = QRect(rect.left(), rect.top(), rect.width(), rect.height() * 2 // 3 - 5)
+        painter.setPen(QPen(QColor("#3498db"), 2) if hovered else Qt.NoPen)
+        painter.setBrush(QColor("#f8f9fa"))
+        painter.drawRoundedRect(icon_rect, 10, 10)
+        painter.setFont(self.icon_font)
+        painter.setPen(QColor("black"))
+        painter.drawText(icon_rect, Qt.AlignCenter, "📱")
+
+        # Name label
+        name_rect = QRect(rect.left(), icon_rect.bottom() + 5, rect.width(), rect.bottom() - icon_rect.bottom() - 5)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("blue") if selected else QColor("white"))
+        painter.drawRect(name_rect)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("white") if selected else QColor("black"))
+        name = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, name_rect.width() - 10)
+        painter.drawText(name_rect, Qt.AlignCenter, name)
+        painter.restore()
+
+
+class AppGridView(QListView):
+    """Virtualized grid: only visible cards are laid out and painted"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app_model = AppListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.app_model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setModel(self.proxy)
+        self.setItemDelegate(AppCardDelegate(self))
+
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSpacing(10)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setMouseTracking(True)
+        self.setFrameShape(QListView.NoFrame)
+        self.clicked.connect(self.on_clicked)
+
+    def on_clicked(self, proxy_index):
+        self.app_model.toggle(self.proxy.mapToSource(proxy_index).row())
+
+    def set_filter(self, text):
+        self.proxy.setFilterFixedString(text)
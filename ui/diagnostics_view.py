@@ -0,0 +1,61 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+REFRESH_MS = 1000
+
+
+def format_seconds(seconds):
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+class DiagnosticsDialog(QDialog):
+    """Live view of the enforcement loop's metrics, refreshed every second"""
+
+    def __init__(self, focus_guard, parent=None):
+        super().__init__(parent)
+        self.focus_guard = focus_guard
+        self.setWindowTitle("FocusGuard - Diagnostics")
+        self.resize(420, 320)
+
+        layout = QVBoxLayout(self)
+        title = QLabel("🩺 Diagnostics")
+        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        layout.addWidget(title)
+        self.body = QLabel()
+        self.body.setTextFormat(Qt.PlainText)
+        self.body.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.body.setFont(QFont("Courier New", 10))
+        layout.addWidget(self.body)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_MS)
+        self.refresh()
+
+    def refresh(self):
+        metrics = self.focus_guard.get_metrics()
+        if not metrics.get('enabled'):
+            self.body.setText("Metrics are disabled.\nStart FocusGuard with --metrics to collect them.")
+            self.timer.stop()
+            return
+        scan = metrics['scan_duration_seconds']
+        processes = metrics['scan_processes']
+        latency = metrics['kill_latency_seconds']
+        lifetime = metrics['blocked_lifetime_seconds']
+        failures = metrics['kill_failures_total'] or {}
+        lines = [
+            f"Sessions started   {metrics['sessions_total']}",
+            f"Scans              {scan['count']}",
+            f"Scan time          mean {format_seconds(scan['mean'])}, p95 {format_seconds(scan['p95'])}",
+            f"Processes/scan     mean {processes['mean']:.0f}",
+            f"Trees killed       {metrics['kills_total']}",
+            f"Kill latency       p50 {format_seconds(latency['p50'])}, p95 {format_seconds(latency['p95'])}",
+            f"Blocked app lived  p50 {format_seconds(lifetime['p50'])}, p95 {format_seconds(lifetime['p95'])}",
+            "Kill failures      " + (", ".join(
+                f"{reason} {count}" for reason, count in sorted(failures.items())
+            ) or "none"),
+        ]
+        self.body.setText("\n".join(lines))
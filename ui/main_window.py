@@ -2,21 +2,54 @@ import sys
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QSpinBox, QGridLayout, QScrollArea, QFrame,
-    QSizePolicy, QMessageBox,  QHBoxLayout, QSpacerItem, QSizePolicy
+    QSizePolicy, QMessageBox,  QHBoxLayout, QSpacerItem, QSizePolicy,
+    QLineEdit, QCheckBox
 )
-from PyQt5.QtCore import Qt, QTimer
+import time
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 
-from backend.app_logic import FocusGuard
-from .app_card import AppCard
+from backend.startup_profile import profiler
+from .app_grid import AppGridView
 from PyQt5.QtWidgets import QInputDialog
 from PyQt5.QtGui import QFont, QColor, QPalette, QIcon
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitted once the backend is loaded and the app grid is filled
+    backend_ready = pyqtSignal()
+
+    def __init__(self, focus_guard=None, backend_options=None):
         super().__init__()
-        self.focus_guard = FocusGuard()
+        # The backend is created after the first paint, see init_backend
+        self.focus_guard = focus_guard
+        self.backend_options = backend_options or {}
+        self.backend_scheduled = False
         self.init_ui()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.backend_scheduled:
+            self.backend_scheduled = True
+            profiler.mark("first paint")
+            QTimer.singleShot(0, self.init_backend)
+
+    def init_backend(self):
+        """Load the backend and app list once the window is visible"""
+        if self.focus_guard is None:
+            with profiler.phase("import backend"):
+                from backend.app_logic import FocusGuard
+            with profiler.phase("backend init"):
+                self.focus_guard = FocusGuard(**self.backend_options)
+        with profiler.phase("load apps"):
+            self.load_apps()
         self.connect_signals()
+        self.start_btn.setEnabled(True)
+        self.add_app_btn.setEnabled(True)
+        self.stats_btn.setEnabled(True)
+        self.schedules_btn.setEnabled(True)
+        self.diagnostics_btn.setEnabled(True)
+        self.status_text.setText("Focus session not started")
+        profiler.mark("backend ready")
+        self.backend_ready.emit()
         
     def init_ui(self):
         self.setWindowTitle("FocusGuard - Distraction Blocker")
@@ -108,10 +141,16 @@ class MainWindow(QMainWindow):
         self.status_dot.setStyleSheet("background-color: #e74c3c; border-radius: 6px;")
         status_layout.addWidget(self.status_dot)
         
-        self.status_text = QLabel("Focus session not started")
+        self.status_text = QLabel("Loading apps...")
         status_layout.addWidget(self.status_text)
         sidebar_layout.addLayout(status_layout)
         
+        self.strict_input = QCheckBox("Strict: block every app not selected")
+        self.strict_input.setToolTip(
+            "Also block apps missing from the app list. System and desktop processes keep running."
+        )
+        sidebar_layout.addWidget(self.strict_input)
+        
         # Start/Stop buttons
         self.start_btn = QPushButton("🚀 Start Focus Session")
         self.start_btn.setStyleSheet(
@@ -135,6 +174,7 @@ class MainWindow(QMainWindow):
    )
         
         self.start_btn.setFixedHeight(50)
+        self.start_btn.setEnabled(False)
         self.start_btn.clicked.connect(self.start_session)
         sidebar_layout.addWidget(self.start_btn)
         
@@ -147,6 +187,44 @@ class MainWindow(QMainWindow):
         self.stop_btn.setVisible(False)
         sidebar_layout.addWidget(self.stop_btn)
         
+        # Blocked apps summary, refreshed at most once per frame
+        blocked_title = QLabel("🚫 Blocked so far")
+        blocked_title.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        sidebar_layout.addWidget(blocked_title)
+        
+        self.blocked_panel = QLabel("Nothing blocked yet")
+        self.blocked_panel.setTextFormat(Qt.PlainText)
+        self.blocked_panel.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.blocked_panel.setFont(QFont("Courier New", 9))
+        sidebar_layout.addWidget(self.blocked_panel)
+        
+        self.stats_btn = QPushButton("📊 Statistics")
+        self.stats_btn.setStyleSheet(
+            "background-color: #e9ecef; font-weight: bold;"
+        )
+        self.stats_btn.setFixedHeight(36)
+        self.stats_btn.setEnabled(False)
+        self.stats_btn.clicked.connect(self.show_stats)
+        sidebar_layout.addWidget(self.stats_btn)
+        
+        self.schedules_btn = QPushButton("🗓️ Schedules")
+        self.schedules_btn.setStyleSheet(
+            "background-color: #e9ecef; font-weight: bold;"
+        )
+        self.schedules_btn.setFixedHeight(36)
+        self.schedules_btn.setEnabled(False)
+        self.schedules_btn.clicked.connect(self.show_schedules)
+        sidebar_layout.addWidget(self.schedules_btn)
+        
+        self.diagnostics_btn = QPushButton("🩺 Diagnostics")
+        self.diagnostics_btn.setStyleSheet(
+            "background-color: #e9ecef; font-weight: bold;"
+        )
+        self.diagnostics_btn.setFixedHeight(36)
+        self.diagnostics_btn.setEnabled(False)
+        self.diagnostics_btn.clicked.connect(self.show_diagnostics)
+        sidebar_layout.addWidget(self.diagnostics_btn)
+        
         sidebar_layout.addStretch()
         
         # Right content area
@@ -168,18 +246,18 @@ class MainWindow(QMainWindow):
         desc.setWordWrap(True)
         content_layout.addWidget(desc)
         
-        # Apps grid with scroll
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.NoFrame)
-        
-        self.apps_container = QWidget()
-        self.apps_grid = QGridLayout(self.apps_container)
-        self.apps_grid.setSpacing(20)
-        self.apps_grid.setContentsMargins(10, 10, 10, 10)
+        # Search
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Search apps")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedHeight(32)
+        content_layout.addWidget(self.search_input)
         
-        scroll_area.setWidget(self.apps_container)
-        content_layout.addWidget(scroll_area)
+        # Apps grid (virtualized, scrolls by itself)
+        self.apps_view = AppGridView()
+        self.search_input.textChanged.connect(self.apps_view.set_filter)
+        self.apps_view.app_model.selectionChanged.connect(self.on_app_selection_changed)
+        content_layout.addWidget(self.apps_view)
         
         # Add app button
         self.add_app_btn = QPushButton("+ Add Application")
@@ -204,6 +282,7 @@ class MainWindow(QMainWindow):
    )
         
         self.add_app_btn.setFixedHeight(40)
+        self.add_app_btn.setEnabled(False)
         self.add_app_btn.clicked.connect(self.add_custom_app)
         content_layout.addWidget(self.add_app_btn)
         
@@ -211,34 +290,20 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(sidebar)
         main_layout.addWidget(content)
         
-        # Load apps
-        self.load_apps()
-        
     def connect_signals(self):
         self.focus_guard.session_started.connect(self.on_session_started)
         self.focus_guard.session_stopped.connect(self.on_session_stopped)
-        self.focus_guard.app_blocked.connect(self.on_app_blocked)
+        self.focus_guard.blocks_updated.connect(self.update_blocked_panel)
         self.focus_guard.timer_updated.connect(self.update_timer_display)
         self.focus_guard.status_changed.connect(self.status_text.setText)
+        self.focus_guard.mappings_changed.connect(self.on_mappings_changed)
         
     def load_apps(self):
-        app_list = self.focus_guard.get_app_list()
-        row, col = 0, 0
-        for app in app_list:
-            card = AppCard(app)
-            self.apps_grid.addWidget(card, row, col)
-            col += 1
-            if col > 2:  # 3 columns
-                col = 0
-                row += 1
+        """Sync the grid with the backend's app list, row by row"""
+        self.apps_view.app_model.set_apps(self.focus_guard.get_app_list())
                 
     def get_selected_apps(self):
-        selected = []
-        for i in range(self.apps_grid.count()):
-            widget = self.apps_grid.itemAt(i).widget()
-            if isinstance(widget, AppCard) and widget.is_selected:
-                selected.append(widget.app_name)
-        return selected
+        return self.apps_view.app_model.selected_apps()
         
     def start_session(self):
         selected_apps = self.get_selected_apps()
@@ -249,7 +314,7 @@ class MainWindow(QMainWindow):
                                "Select at least one app to start session")
             return
                 
-        self.focus_guard.start_session(selected_apps, duration)
+        self.focus_guard.start_session(selected_apps, duration, strict=self.strict_input.isChecked())
         
     def stop_session(self):
         self.focus_guard.stop_session()
@@ -274,9 +339,32 @@ class MainWindow(QMainWindow):
         self.update_timer_display(25, 0)
         QMessageBox.information(self, "Session Stopped", message)
         
-    def on_app_blocked(self, app_name):
-        # Could show a notification or update UI
-        print(f"Blocked: {app_name}")
+    def update_blocked_panel(self, blocks):
+        """Show per-app block counts, most blocked first"""
+        if not blocks:
+            self.blocked_panel.setText("Nothing blocked yet")
+            return
+        total = sum(count for count, _ in blocks.values())
+        top = sorted(blocks.items(), key=lambda item: item[1][0], reverse=True)[:8]
+        lines = [f"{total} blocks, {len(blocks)} apps"]
+        for name, (count, last_seen) in top:
+            when = time.strftime('%H:%M:%S', time.localtime(last_seen))
+            lines.append(f"{name[:14]:<14} x{count:<4} {when}")
+        if len(blocks) > len(top):
+            lines.append(f"... and {len(blocks) - len(top)} more")
+        self.blocked_panel.setText("\n".join(lines))
+        
+    def show_stats(self):
+        from .stats_view import StatsDialog
+        StatsDialog(self.focus_guard, self).exec_()
+        
+    def show_schedules(self):
+        from .schedule_view import ScheduleDialog
+        ScheduleDialog(self.focus_guard, self).exec_()
+        
+    def show_diagnostics(self):
+        from .diagnostics_view import DiagnosticsDialog
+        DiagnosticsDialog(self.focus_guard, self).exec_()
         
     def update_timer_display(self, mins, secs):
         self.timer_display.setText(f"{mins:02d}:{secs:02d}")
@@ -301,14 +389,12 @@ class MainWindow(QMainWindow):
         
         success = self.focus_guard.add_custom_app(display_name, process_name)
         if success:
+            # The grid reloads through mappings_changed
             QMessageBox.information(
                 self, 
                 "Success", 
                 f"Added {display_name} successfully!"
             )
-        # Clear existing apps and reload
-            self.clear_apps_grid()
-            self.load_apps()
         else:
             QMessageBox.warning(
                 self,
@@ -316,28 +402,11 @@ class MainWindow(QMainWindow):
                 f"Failed to add {display_name}. Check logs for details."
             )
 
-    def clear_apps_grid(self):
-        """Remove all app cards from grid"""
-        while self.apps_grid.count():
-            child = self.apps_grid.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    def on_mappings_changed(self):
+        """Apply changed mappings to the grid; selection is kept by the model"""
+        self.load_apps()
 
-    def load_apps(self):
-        app_list = self.focus_guard.get_app_list()
-        row, col = 0, 0
-        for app in app_list:
-            card = AppCard(app)
-        
-            # Connect the selection changed signal
-            card.selectionChanged.connect(self.on_app_selection_changed)
-        
-            self.apps_grid.addWidget(card, row, col)
-            col += 1
-            if col > 2:  # 3 columns
-                col = 0
-                row += 1
-    def on_app_selection_changed(self, is_selected):
+    def on_app_selection_changed(self):
         """Handle when an app card is selected/deselected"""
         # We can use this to update UI state if needed
         pass
\ No newline at end of file
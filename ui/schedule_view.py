@@ -0,0 +1,122 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QCheckBox,
+    QTimeEdit, QListWidget, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTime
+from PyQt5.QtGui import QFont
+
+DAY_LABELS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def format_days(days):
+    if sorted(days) == list(range(7)):
+        return "Daily"
+    if sorted(days) == list(range(5)):
+        return "Weekdays"
+    return ", ".join(DAY_LABELS[day] for day in sorted(days))
+
+
+class ScheduleDialog(QDialog):
+    """List, add and remove recurring focus sessions"""
+
+    def __init__(self, focus_guard, parent=None):
+        super().__init__(parent)
+        self.focus_guard = focus_guard
+        self.setWindowTitle("FocusGuard - Schedules")
+        self.resize(640, 520)
+
+        layout = QVBoxLayout(self)
+        title = QLabel("🗓️ Scheduled Sessions")
+        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        layout.addWidget(title)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Name", "Days", "Time", "Allowed apps"])
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.table)
+
+        remove_btn = QPushButton("Remove selected")
+        remove_btn.clicked.connect(self.remove_selected)
+        layout.addWidget(remove_btn, alignment=Qt.AlignRight)
+
+        form = QGridLayout()
+        form.addWidget(QLabel("Name"), 0, 0)
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("Morning deep work")
+        form.addWidget(self.name_input, 0, 1)
+
+        form.addWidget(QLabel("Days"), 1, 0)
+        days = QHBoxLayout()
+        self.day_boxes = []
+        for index, label in enumerate(DAY_LABELS):
+            box = QCheckBox(label)
+            box.setChecked(index < 5)
+            self.day_boxes.append(box)
+            days.addWidget(box)
+        form.addLayout(days, 1, 1)
+
+        form.addWidget(QLabel("From / to"), 2, 0)
+        times = QHBoxLayout()
+        self.start_input = QTimeEdit(QTime(9, 0))
+        self.end_input = QTimeEdit(QTime(12, 0))
+        for edit in (self.start_input, self.end_input):
+            edit.setDisplayFormat("HH:mm")
+            times.addWidget(edit)
+        times.addStretch()
+        form.addLayout(times, 2, 1)
+
+        form.addWidget(QLabel("Allowed apps"), 3, 0, Qt.AlignTop)
+        self.apps_input = QListWidget()
+        self.apps_input.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.apps_input.addItems(self.focus_guard.get_app_list())
+        self.apps_input.setMaximumHeight(120)
+        form.addWidget(self.apps_input, 3, 1)
+        layout.addLayout(form)
+
+        add_btn = QPushButton("Add schedule")
+        add_btn.setStyleSheet("background-color: #2ecc71; color: white; font-weight: bold;")
+        add_btn.clicked.connect(self.add_schedule)
+        layout.addWidget(add_btn)
+
+        self.schedules = []
+        self.refresh()
+
+    def refresh(self):
+        self.schedules = self.focus_guard.get_schedules()
+        self.table.setRowCount(len(self.schedules))
+        for row, schedule in enumerate(self.schedules):
+            values = (
+                schedule['name'], format_days(schedule['days']),
+                f"{schedule['start']} - {schedule['end']}", ", ".join(schedule['apps']),
+            )
+            for column, text in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+
+    def add_schedule(self):
+        name = self.name_input.text().strip()
+        days = [index for index, box in enumerate(self.day_boxes) if box.isChecked()]
+        apps = [item.text() for item in self.apps_input.selectedItems()]
+        if not name or not days or not apps:
+            QMessageBox.warning(self, "Incomplete Schedule", "Enter a name and pick at least one day and app")
+            return
+        try:
+            self.focus_guard.add_schedule(
+                name, days, self.start_input.time().toString("HH:mm"),
+                self.end_input.time().toString("HH:mm"), apps,
+            )
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Schedule", str(e))
+            return
+        self.name_input.clear()
+        self.refresh()
+
+    def remove_selected(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()})
+        for row in rows:
+            self.focus_guard.remove_schedule(self.schedules[row]['id'])
+        if rows:
+            self.refresh()
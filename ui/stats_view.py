@@ -0,0 +1,91 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+
+# Range label -> days (None for all history)
+RANGES = [("Last 7 days", 7), ("Last 30 days", 30), ("Last year", 365), ("All time", None)]
+
+
+def format_duration(seconds):
+    minutes = int(seconds // 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m"
+
+
+class StatsDialog(QDialog):
+    """Focus time and block counts per day and per app"""
+
+    def __init__(self, focus_guard, parent=None):
+        super().__init__(parent)
+        self.focus_guard = focus_guard
+        self.setWindowTitle("FocusGuard - Statistics")
+        self.resize(640, 480)
+
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        title = QLabel("📊 Focus Statistics")
+        title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        header.addWidget(title)
+        header.addStretch()
+        self.range_input = QComboBox()
+        for label, days in RANGES:
+            self.range_input.addItem(label, days)
+        self.range_input.currentIndexChanged.connect(self.refresh)
+        header.addWidget(self.range_input)
+        layout.addLayout(header)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+
+        tables = QHBoxLayout()
+        self.day_table = self.make_table(["Day", "Focus", "Sessions", "Blocks"])
+        self.app_table = self.make_table(["App", "Focus", "Blocks"])
+        tables.addWidget(self.day_table)
+        tables.addWidget(self.app_table)
+        layout.addLayout(tables)
+
+        self.refresh()
+
+    @staticmethod
+    def make_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.NoSelection)
+        return table
+
+    @staticmethod
+    def fill_table(table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, item)
+
+    def refresh(self):
+        stats = self.focus_guard.get_stats(self.range_input.currentData())
+        per_day, per_app = stats['per_day'], stats['per_app']
+
+        focus = sum(totals['focus'] for totals in per_day.values())
+        sessions = sum(totals['sessions'] for totals in per_day.values())
+        blocks = sum(totals['blocks'] for totals in per_day.values())
+        self.summary.setText(
+            f"{format_duration(focus)} focused in {sessions} sessions, {blocks} apps blocked"
+        )
+
+        self.fill_table(self.day_table, [
+            [day, format_duration(t['focus']), str(t['sessions']), str(t['blocks'])]
+            for day, t in sorted(per_day.items(), reverse=True)
+        ])
+        # Most focused apps first, then the most blocked
+        self.fill_table(self.app_table, [
+            [app, format_duration(t['focus']), str(t['blocks'])]
+            for app, t in sorted(per_app.items(), key=lambda item: (-item[1]['focus'], -item[1]['blocks']))
+        ])